@@ -0,0 +1,96 @@
+"""Times MathQuiz screen changes: rebuilding the widgets versus reusing them.
+
+    python bench_mathquiz.py                 # 200 questions, best of 3
+    python bench_mathquiz.py --questions 1000 --repeat 5
+
+Needs a display. "rebuild" destroys the question screen and builds it
+again for every question, as the quiz used to; "reuse" only updates the
+labels of the prebuilt screen. Each question is drawn (root.update())
+before the next one, so the times include Tk's layout and redraw. The
+script also checks that hidden screens cannot keep the keyboard focus.
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import time
+import tkinter as tk
+
+QUIZ_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "exercise 1.py")
+
+
+def load_quiz_class():
+    # The file name has a space in it, so it cannot be imported by name
+    spec = importlib.util.spec_from_file_location("math_quiz", QUIZ_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.MathQuiz
+
+
+def rebuild_question(quiz):
+    """What every question used to cost: fresh widgets for the whole screen"""
+    quiz.screens.remove(quiz.question_screen)
+    quiz.question_screen.destroy()
+    quiz.question_screen = quiz.build_question_screen()
+
+
+def time_questions(root, quiz, questions, rebuild):
+    quiz.initialize_game(1)
+    root.update()
+    start = time.perf_counter()
+    for _ in range(questions):
+        # Stay below the 10-question limit so every step shows a question
+        quiz.question_count = 0
+        if rebuild:
+            rebuild_question(quiz)
+        quiz.display_question()
+        root.update()
+    return time.perf_counter() - start
+
+
+def check_focus(root, quiz):
+    """Return problems with keyboard focus after leaving the question screen"""
+    problems = []
+    for name, leave in (("main menu", quiz.display_main_menu), ("results", quiz.show_final_results)):
+        quiz.initialize_game(1)
+        root.update()
+        leave()
+        root.update()
+        if root.focus_get() is quiz.answer_entry:
+            problems.append(f"the hidden answer box keeps the focus on the {name} screen")
+        if quiz.answer_entry.winfo_viewable():
+            problems.append(f"the answer box is still viewable on the {name} screen")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time MathQuiz question changes")
+    parser.add_argument("--questions", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display available ({e}); run this on a desktop or under Xvfb", file=sys.stderr)
+        return 1
+    try:
+        quiz = load_quiz_class()(root)
+        root.update()
+        timings = {}
+        for label, rebuild in (("rebuild", True), ("reuse", False)):
+            timings[label] = min(time_questions(root, quiz, args.questions, rebuild)
+                                 for _ in range(args.repeat))
+            print(f"{label:8} {timings[label] / args.questions * 1000:8.3f} ms per question")
+        print(f"reusing the screen is {timings['rebuild'] / timings['reuse']:.1f}x faster")
+        problems = check_focus(root, quiz)
+    finally:
+        root.destroy()
+    for problem in problems:
+        print(f"PROBLEM: {problem}")
+    print("FAILED" if problems else "OK: hidden screens never hold the focus")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
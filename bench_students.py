@@ -0,0 +1,194 @@
+"""Benchmarks for the student manager's core operations at growing roster sizes.
+
+    python bench_students.py                          # 10^3 .. 10^5 students
+    python bench_students.py --sizes 1000 1000000 --output after.json
+    python bench_students.py --compare before.json after.json
+
+Every operation is timed (best of --repeat runs) and then run once more
+under tracemalloc for its peak memory. Results are written as JSON so two
+runs, e.g. from two commits, can be compared for regressions.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from student_core import (
+    TextStorage, format_statistics, load_students, make_student, snapshot_rows,
+)
+
+FIRST_NAMES = ["Aisha", "Ben", "Chloe", "Daniel", "Emma", "Farhan", "Grace", "Hassan", "Isla",
+               "Jack", "Keira", "Liam", "Maya", "Noah", "Olivia", "Priya", "Quinn", "Ravi",
+               "Sofia", "Tom", "Uma", "Victor", "Wei", "Yusuf", "Zara"]
+LAST_NAMES = ["Ahmed", "Brown", "Chen", "Davies", "Evans", "Khan", "Jones", "Malik", "Nguyen",
+              "Patel", "Roberts", "Singh", "Smith", "Taylor", "Williams", "Wilson"]
+SEARCH_TERMS = ["a", "ch", "pat", "Priya Kh", "S00012", "zzz"]
+PAGE_SIZE = 40
+
+
+def pick(rng, names, distribution):
+    if distribution == "zipf":
+        # Rank-weighted choice: the first names in the list are far more common
+        return rng.choices(names, weights=[1 / (i + 1) for i in range(len(names))])[0]
+    return rng.choice(names)
+
+
+def generate_marks_file(path, size, seed=0, distribution="uniform"):
+    """Write a synthetic studentMarks.txt with the given number of students"""
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        f.write(f"{size}\n")
+        for i in range(size):
+            name = f"{pick(rng, FIRST_NAMES, distribution)} {pick(rng, LAST_NAMES, distribution)}"
+            f.write(f"S{i:07d},{name},{rng.randint(0, 20)},{rng.randint(0, 20)},"
+                    f"{rng.randint(0, 20)},{rng.randint(0, 100)}\n")
+
+
+def measure(func, repeat):
+    """Return (best wall time in seconds, peak traced memory in bytes)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak
+
+
+def bench_size(size, args, workdir):
+    data_file = os.path.join(workdir, "studentMarks.txt")
+    journal_file = os.path.join(workdir, "studentMarks.journal")
+    generate_marks_file(data_file, size, args.seed, args.names)
+    storage = TextStorage(data_file, journal_file)
+    data = load_students(storage=storage)
+
+    def load():
+        load_students(storage=storage)
+
+    def save():
+        storage.compact(snapshot_rows(data))
+
+    def journal_edit():
+        s = data.first()
+        storage.append([("U", s['id'], s['cw1'], s['cw2'], s['cw3'], s['exam'])])
+
+    def view_all():
+        ids = data.ids()
+        return [data.get(sid) for sid in ids[:PAGE_SIZE]]
+
+    def search():
+        for term in SEARCH_TERMS:
+            data.search(term, limit=500)
+
+    def sort():
+        return list(data.ranking.iter_ids(descending=True))
+
+    def statistics():
+        return format_statistics(data)
+
+    def add_update_delete():
+        s = data.add(make_student("BENCH", "Bench Student", 10, 10, 10, 50))
+        data.update(s['id'], 20, 20, 20, 100)
+        data.remove(s['id'])
+
+    operations = {
+        "load_students": load,
+        "save_students": save,
+        "journal_edit": journal_edit,
+        "view_all": view_all,
+        "search_student": search,
+        "sort_records": sort,
+        "show_statistics": statistics,
+        "add_update_delete": add_update_delete,
+    }
+    results = {}
+    for name, func in operations.items():
+        seconds, peak = measure(func, args.repeat)
+        results[name] = {"seconds": seconds, "peak_bytes": peak}
+        print(f"{size:>9} {name:<24} {seconds * 1000:>10.2f} ms {peak / 1024:>12.0f} KiB")
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ""
+
+
+def run(args):
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "seed": args.seed,
+        "names": args.names,
+        "repeat": args.repeat,
+        "results": {},
+    }
+    print(f"{'students':>9} {'operation':<24} {'best time':>13} {'peak memory':>16}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            report["results"][str(size)] = bench_size(size, args, workdir)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+def compare(before_path, after_path, threshold):
+    """Print time ratios between two result files; exit status 1 on a regression"""
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    regressions = 0
+    print(f"{'students':>9} {'operation':<24} {'before ms':>10} {'after ms':>10} {'ratio':>7}")
+    for size, ops in after["results"].items():
+        for name, result in ops.items():
+            old = before["results"].get(size, {}).get(name)
+            if old is None:
+                continue
+            ratio = result["seconds"] / old["seconds"] if old["seconds"] else float("inf")
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            print(f"{size:>9} {name:<24} {old['seconds'] * 1000:>10.2f} "
+                  f"{result['seconds'] * 1000:>10.2f} {ratio:>7.2f}{flag}")
+    print(f"{regressions} regression(s) above {threshold:.0%} "
+          f"({before.get('commit') or before_path} -> {after.get('commit') or after_path})")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark student manager operations")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--names", choices=("uniform", "zipf"), default="uniform",
+                        help="distribution of generated first and last names")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                        help="compare two JSON result files instead of running")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="slowdown ratio above which --compare reports a regression")
+    args = parser.parse_args(argv)
+    if args.compare:
+        return compare(*args.compare, args.threshold)
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,412 +1,1134 @@
-import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
-
-# ---------------- Load and Save Data ----------------
-def load_students():
-    data = []
-    try:
-        with open("studentMarks.txt", "r") as f:
-            lines = f.read().strip().splitlines()
-            for line in lines[1:]:
-                parts = line.split(",")
-                if len(parts) >= 6:
-                    sid, name, cw1, cw2, cw3, exam = parts[0], parts[1], parts[2], parts[3], parts[4], parts[5]
-                    cw1, cw2, cw3, exam = int(cw1), int(cw2), int(cw3), int(exam)
-                    cw_total = cw1 + cw2 + cw3
-                    overall = cw_total + exam
-                    percent = (overall / 160) * 100
-                    grade = (
-                        "A" if percent >= 70 else
-                        "B" if percent >= 60 else
-                        "C" if percent >= 50 else
-                        "D" if percent >= 40 else "F"
-                    )
-                    data.append({
-                        "id": sid, "name": name,
-                        "cw1": cw1, "cw2": cw2, "cw3": cw3, "exam": exam,
-                        "cw_total": cw_total, "overall": overall,
-                        "percent": percent, "grade": grade
-                    })
-    except FileNotFoundError:
-        print("Note: studentMarks.txt will be created when you add first student")
-    except Exception as e:
-        messagebox.showerror("Error", f"Problem loading file: {str(e)}")
-    return data
-
-def save_students():
-    try:
-        with open("studentMarks.txt", "w") as f:
-            f.write(str(len(students)) + "\n")
-            for s in students:
-                f.write(f"{s['id']},{s['name']},{s['cw1']},{s['cw2']},{s['cw3']},{s['exam']}\n")
-    except Exception as e:
-        messagebox.showerror("Error", f"Could not save data: {str(e)}")
-
-# ---------------- Helper Functions ----------------
-def show_output(text):
-    output_box.config(state="normal")
-    output_box.delete("1.0", tk.END)
-    output_box.insert(tk.END, text)
-    output_box.config(state="disabled")
-
-def format_student(s):
-    return (f"Student Name: {s['name']}\n"
-            f"Student ID: {s['id']}\n"
-            f"Coursework Marks: {s['cw1']}, {s['cw2']}, {s['cw3']}\n"
-            f"Coursework Total: {s['cw_total']}/60\n"
-            f"Exam Mark: {s['exam']}/100\n"
-            f"Overall Percentage: {s['percent']:.1f}%\n"
-            f"Final Grade: {s['grade']}\n"
-            f"{'-'*40}\n")
-
-def refresh_combo():
-    student_combo["values"] = [f"{s['name']} ({s['id']})" for s in students]
-    if students:
-        student_combo.set(students[0]['name'] + " (" + students[0]['id'] + ")")
-
-def validate_mark(subject, min_val, max_val, current_val=None):
-    if current_val is not None:
-        prompt = f"Enter {subject} mark ({min_val}-{max_val})\nCurrent: {current_val}"
-    else:
-        prompt = f"Enter {subject} mark ({min_val}-{max_val})"
-    
-    mark = simpledialog.askstring("Input Mark", prompt)
-    if mark is None:
-        return None
-    try:
-        mark_int = int(mark)
-        if min_val <= mark_int <= max_val:
-            return mark_int
-        else:
-            messagebox.showerror("Error", f"{subject} must be between {min_val} and {max_val}")
-            return None
-    except ValueError:
-        messagebox.showerror("Error", "Please enter a valid number")
-        return None
-
-def get_selected_student():
-    sel = student_combo.get()
-    if not sel:
-        messagebox.showwarning("Warning", "Please select a student first")
-        return None
-    try:
-        student_id = sel.split("(")[-1].rstrip(")")
-        for s in students:
-            if s['id'] == student_id:
-                return s
-    except:
-        pass
-    messagebox.showerror("Error", "Student not found")
-    return None
-
-# ---------------- Core Functionalities ----------------
-def view_all():
-    if not students:
-        show_output("No student records available.\nUse 'Add Student' to create new records.")
-        return
-    
-    text = "ALL STUDENT RECORDS\n" + "="*50 + "\n\n"
-    total_percent = 0
-    
-    for i, s in enumerate(students, 1):
-        text += f"Record {i}:\n"
-        text += format_student(s)
-        total_percent += s["percent"]
-    
-    avg = total_percent / len(students)
-    text += f"\nSummary:\n"
-    text += f"Total Students: {len(students)}\n"
-    text += f"Average Percentage: {avg:.1f}%\n"
-    
-    show_output(text)
-
-def view_individual():
-    student = get_selected_student()
-    if student:
-        text = "INDIVIDUAL STUDENT RECORD\n" + "="*50 + "\n\n"
-        text += format_student(student)
-        show_output(text)
-
-def show_highest():
-    if not students:
-        show_output("No student records available")
-        return
-    best = max(students, key=lambda x: x["percent"])
-    text = "HIGHEST PERFORMING STUDENT\n" + "="*50 + "\n\n"
-    text += format_student(best)
-    show_output(text)
-
-def show_lowest():
-    if not students:
-        show_output("No student records available")
-        return
-    lowest = min(students, key=lambda x: x["percent"])
-    text = "LOWEST PERFORMING STUDENT\n" + "="*50 + "\n\n"
-    text += format_student(lowest)
-    show_output(text)
-
-def sort_records():
-    if not students:
-        show_output("No student records available")
-        return
-    
-    if messagebox.askyesno("Sort Records", "Sort by percentage in descending order?"):
-        students.sort(key=lambda x: x["percent"], reverse=True)
-    else:
-        students.sort(key=lambda x: x["percent"], reverse=False)
-    
-    refresh_combo()
-    view_all()
-
-def add_student():
-    sid = simpledialog.askstring("Add Student", "Enter student ID:")
-    if not sid:
-        return
-    
-    if any(s['id'] == sid for s in students):
-        messagebox.showerror("Error", "This student ID already exists")
-        return
-    
-    name = simpledialog.askstring("Add Student", "Enter student name:")
-    if not name:
-        return
-    
-    cw1 = validate_mark("Coursework 1", 0, 20)
-    if cw1 is None: return
-    
-    cw2 = validate_mark("Coursework 2", 0, 20)
-    if cw2 is None: return
-    
-    cw3 = validate_mark("Coursework 3", 0, 20)
-    if cw3 is None: return
-    
-    exam = validate_mark("Exam", 0, 100)
-    if exam is None: return
-
-    cw_total = cw1 + cw2 + cw3
-    overall = cw_total + exam
-    percent = (overall / 160) * 100
-    grade = ("A" if percent >= 70 else "B" if percent >= 60 else
-             "C" if percent >= 50 else "D" if percent >= 40 else "F")
-    
-    new_student = {
-        "id": sid, "name": name,
-        "cw1": cw1, "cw2": cw2, "cw3": cw3, "exam": exam,
-        "cw_total": cw_total, "overall": overall,
-        "percent": percent, "grade": grade
-    }
-    
-    students.append(new_student)
-    save_students()
-    refresh_combo()
-    
-    text = "NEW STUDENT ADDED SUCCESSFULLY\n" + "="*50 + "\n\n"
-    text += format_student(new_student)
-    show_output(text)
-
-def delete_student():
-    student = get_selected_student()
-    if not student:
-        return
-    
-    if messagebox.askyesno("Confirm Delete", f"Delete {student['name']}? This cannot be undone."):
-        students.remove(student)
-        save_students()
-        refresh_combo()
-        show_output(f"Student {student['name']} has been deleted successfully.\nRemaining students: {len(students)}")
-
-def update_student():
-    student = get_selected_student()
-    if not student:
-        return
-    
-    cw1 = validate_mark("Coursework 1", 0, 20, student["cw1"])
-    if cw1 is None: return
-    
-    cw2 = validate_mark("Coursework 2", 0, 20, student["cw2"])
-    if cw2 is None: return
-    
-    cw3 = validate_mark("Coursework 3", 0, 20, student["cw3"])
-    if cw3 is None: return
-    
-    exam = validate_mark("Exam", 0, 100, student["exam"])
-    if exam is None: return
-
-    student["cw1"] = cw1
-    student["cw2"] = cw2
-    student["cw3"] = cw3
-    student["exam"] = exam
-    student["cw_total"] = cw1 + cw2 + cw3
-    student["overall"] = student["cw_total"] + exam
-    student["percent"] = (student["overall"] / 160) * 100
-    student["grade"] = ("A" if student["percent"] >= 70 else
-                      "B" if student["percent"] >= 60 else
-                      "C" if student["percent"] >= 50 else
-                      "D" if student["percent"] >= 40 else "F")
-    
-    save_students()
-    refresh_combo()
-    
-    text = "STUDENT RECORD UPDATED\n" + "="*50 + "\n\n"
-    text += format_student(student)
-    show_output(text)
-
-def search_student():
-    search_term = simpledialog.askstring("Search", "Enter student name or ID to search:")
-    if not search_term:
-        return
-    
-    results = []
-    for s in students:
-        if search_term.lower() in s['name'].lower() or search_term in s['id']:
-            results.append(s)
-    
-    if not results:
-        show_output(f"No students found matching '{search_term}'")
-        return
-    
-    text = f"SEARCH RESULTS FOR '{search_term}'\n" + "="*50 + "\n\n"
-    for s in results:
-        text += format_student(s)
-    
-    text += f"\nFound {len(results)} matching record(s)"
-    show_output(text)
-
-def show_statistics():
-    if not students:
-        show_output("No student data available for statistics")
-        return
-    
-    percentages = [s['percent'] for s in students]
-    grades = [s['grade'] for s in students]
-    
-    text = "CLASS STATISTICS AND GRADE DISTRIBUTION\n" + "="*50 + "\n\n"
-    text += f"Total Students: {len(students)}\n"
-    text += f"Average Percentage: {sum(percentages)/len(percentages):.1f}%\n"
-    text += f"Highest Percentage: {max(percentages):.1f}%\n"
-    text += f"Lowest Percentage: {min(percentages):.1f}%\n\n"
-    text += "Grade Distribution:\n"
-    text += f"A Grades: {grades.count('A')}\n"
-    text += f"B Grades: {grades.count('B')}\n"
-    text += f"C Grades: {grades.count('C')}\n"
-    text += f"D Grades: {grades.count('D')}\n"
-    text += f"F Grades: {grades.count('F')}\n"
-    
-    show_output(text)
-
-# ---------------- GUI Setup ----------------
-students = load_students()
-
-root = tk.Tk()
-root.title("Student Manager")
-root.geometry("900x650")
-root.configure(bg='#f5f7fa')
-
-# Colors
-PRIMARY_COLOR = '#3498db'
-SECONDARY_COLOR = '#2ecc71'
-ACCENT_COLOR = '#e74c3c'
-BG_COLOR = '#f5f7fa'
-CARD_COLOR = '#ffffff'
-TEXT_COLOR = '#2c3e50'
-
-main_frame = tk.Frame(root, bg=BG_COLOR)
-main_frame.pack(fill='both', expand=True, padx=15, pady=15)
-
-header_frame = tk.Frame(main_frame, bg=PRIMARY_COLOR, height=80)
-header_frame.pack(fill='x', pady=(0, 15))
-header_frame.pack_propagate(False)
-
-tk.Label(header_frame, text="Student Manager", 
-          font=('Arial', 20, 'bold'), 
-          bg=PRIMARY_COLOR, fg='white').pack(expand=True)
-
-content_frame = tk.Frame(main_frame, bg=BG_COLOR)
-content_frame.pack(fill='both', expand=True)
-
-left_panel = tk.Frame(content_frame, bg=CARD_COLOR, relief=tk.RAISED, bd=1)
-left_panel.pack(side='left', fill='y', padx=(0, 15))
-
-right_panel = tk.Frame(content_frame, bg=BG_COLOR)
-right_panel.pack(side='right', fill='both', expand=True)
-
-tk.Label(left_panel, text="View Individual Student Record:", 
-         font=('Arial', 11, 'bold'), bg=CARD_COLOR, fg=TEXT_COLOR).pack(anchor='w', pady=(15, 5), padx=15)
-
-student_combo = ttk.Combobox(left_panel, width=25, font=('Arial', 10))
-student_combo.pack(fill='x', padx=15, pady=(0, 10))
-refresh_combo()
-
-tk.Button(left_panel, text="View Record", font=('Arial', 10, 'bold'), 
-          bg=PRIMARY_COLOR, fg='white', command=view_individual, width=15).pack(pady=(0, 20))
-
-nav_buttons = [
-    ("View All Student Records", view_all, PRIMARY_COLOR),
-    ("Show Highest Score", show_highest, SECONDARY_COLOR),
-    ("Show Lowest Score", show_lowest, SECONDARY_COLOR),
-]
-
-for text, command, color in nav_buttons:
-    tk.Button(left_panel, text=text, font=('Arial', 10, 'bold'),
-              bg=color, fg='white', command=command, width=20).pack(pady=8, padx=15)
-
-separator = tk.Frame(left_panel, height=2, bg='#e0e0e0')
-separator.pack(fill='x', pady=20, padx=10)
-
-edit_buttons = [
-    ("Add Student", add_student, SECONDARY_COLOR),
-    ("Update Student", update_student, '#f39c12'),
-    ("Delete Student", delete_student, ACCENT_COLOR),
-    ("Search Student", search_student, PRIMARY_COLOR),
-    ("Class Statistics", show_statistics, '#9b59b6'),
-    ("Sort Records", sort_records, '#1abc9c'),
-]
-
-for text, command, color in edit_buttons:
-    tk.Button(left_panel, text=text, font=('Arial', 10),
-              bg=color, fg='white', command=command, width=15).pack(pady=5, padx=15)
-
-output_frame = tk.Frame(right_panel, bg=CARD_COLOR, relief=tk.RAISED, bd=1)
-output_frame.pack(fill='both', expand=True)
-
-tk.Label(output_frame, text="Student Records", 
-          font=('Arial', 12, 'bold'), 
-          bg=PRIMARY_COLOR, fg='white').pack(fill='x')
-
-# Output Textbox with Scrollbar
-output_box = tk.Text(output_frame, width=60, height=25, wrap=tk.WORD,
-                     bg='#fafafa', fg=TEXT_COLOR, font=('Consolas', 10),
-                     relief=tk.FLAT, bd=0)
-output_box.pack(fill='both', expand=True, padx=10, pady=10)
-
-scrollbar = tk.Scrollbar(output_frame, command=output_box.yview)
-scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-output_box.config(yscrollcommand=scrollbar.set)
-
-# Status Bar
-if students:
-    avg_percent = sum(s['percent'] for s in students) / len(students)
-else:
-    avg_percent = 0
-
-status_bar = tk.Label(root, text=f"Total Students: {len(students)} | Average Percentage: {avg_percent:.1f}%", 
-                     bg='#34495e', fg='white', font=('Arial', 10), anchor='w')
-status_bar.pack(fill='x', side=tk.BOTTOM)
-
-welcome_msg = f"""Welcome to Student Manager
-
-Loaded {len(students)} student records from file.
-
-Use the buttons to:
-• View all student records
-• Search for specific students
-• Add new students
-• Update existing records
-• Analyze class performance
-• Sort and organize data
-
-All changes are automatically saved to file.
-"""
-show_output(welcome_msg)
-
-root.mainloop()
+import copy
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+import tkinter as tk
+import traceback
+from tkinter import ttk, messagebox, simpledialog, filedialog
+
+from student_core import (
+    COMPACT_THRESHOLD, DATA_FILE, GRADING_FILE, ConflictError, GradingScheme,
+    ShardSet, StudentStore, add_loaded_chunk, apply_mark_batch, apply_state, coalesce_entries, export_records,
+    export_statistics, external_states, field_problem,
+    format_grading_scheme, format_shard_statistics, format_statistics, get_grading_scheme,
+    make_student, merge_external, open_storage, parse_mark_batch, regrade_roster,
+    render_student, replay_journal, set_grading_scheme, snapshot_rows,
+)
+from student_metrics import CommandMetrics
+
+# ---------------- Background File I/O ----------------
+class IOWorker:
+    """One background thread that performs all file I/O in submission order.
+
+    Results travel back through a queue drained by poll() on the Tk thread,
+    so callbacks are free to touch widgets.
+    """
+    POLL_MS = 40
+
+    def __init__(self, root):
+        self.root = root
+        self.jobs = queue.Queue()
+        self.results = queue.Queue(maxsize=32)
+        self.pending = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.root.after(self.POLL_MS, self.poll)
+
+    def submit(self, func, *args, on_done=None):
+        """Run func(*args) on the worker; on_done(result, error) is called on the Tk thread"""
+        self.pending += 1
+        self.jobs.put((func, args, on_done))
+
+    def call_soon(self, func, *args):
+        """From the worker: run func(*args) on the Tk thread (blocks while the queue is full)"""
+        self.results.put((func, args))
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            func, args, on_done = job
+            try:
+                result, error = func(*args), None
+            except Exception as e:
+                result, error = None, e
+            self.results.put((self._finished, (on_done, result, error)))
+
+    def _finished(self, on_done, result, error):
+        self.pending -= 1
+        if on_done:
+            on_done(result, error)
+
+    def _drain(self, limit=None):
+        handled = 0
+        while limit is None or handled < limit:
+            try:
+                func, args = self.results.get_nowait()
+            except queue.Empty:
+                break
+            handled += 1
+            self._call(func, args)
+
+    @staticmethod
+    def _call(func, args):
+        # One failing callback must not stop every later result arriving
+        try:
+            func(*args)
+        except Exception:
+            print(f"Error in background I/O callback {getattr(func, '__name__', func)}:")
+            traceback.print_exc()
+
+    def poll(self):
+        try:
+            self._drain(limit=50)
+        finally:
+            self.root.after(self.POLL_MS, self.poll)
+
+    def wait(self):
+        """Block until every submitted job has finished and its callback has run"""
+        while self.pending:
+            try:
+                func, args = self.results.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            self._call(func, args)
+
+    def close(self):
+        """Finish every queued job, then stop the thread"""
+        self.jobs.put(None)
+        while self.thread.is_alive():
+            self._drain()
+            self.thread.join(0.05)
+        self._drain()
+
+def load_in_background(errors):
+    """Worker job: stream the data file into the store, then hand back the journal"""
+    try:
+        for chunk in storage.iter_chunks(errors):
+            io_worker.call_soon(add_chunk_to_view, chunk)
+    except FileNotFoundError:
+        print("Note: studentMarks.txt will be created when you add first student")
+    return storage.read_changes()
+
+def start_loading():
+    global loading
+    loading = True
+    load_errors.clear()
+    show_output("Loading student records...")
+    status_bar.config(text="Loading student records...")
+    io_worker.submit(load_in_background, load_errors, on_done=finish_loading)
+
+def add_chunk_to_view(chunk):
+    was_empty = not students
+    add_loaded_chunk(students, chunk, load_errors)
+    if was_empty:
+        refresh_combo()
+    status_bar.config(text=f"Loading student records... {len(students)} so far")
+
+def finish_loading(entries, error):
+    global loading, journal_entries
+    if error:
+        messagebox.showerror("Error", f"Problem loading file: {str(error)}")
+    journal_entries = replay_journal(students, entries or [], load_errors)
+    loading = False
+    refresh_combo()
+    update_status_bar()
+    show_output(welcome_message())
+    root.after_idle(build_search_index)
+
+def build_search_index():
+    """Index names for search a slice at a time, so the window stays responsive"""
+    if not students.search_index.build(limit=SEARCH_INDEX_SLICE):
+        root.after(1, build_search_index)
+
+def still_loading():
+    if loading:
+        messagebox.showinfo("Please Wait", "Student records are still loading.")
+    return loading
+
+def submit_write(func, *args):
+    global writes_in_flight
+    writes_in_flight += 1
+    io_worker.submit(func, *args, on_done=write_finished)
+
+def write_finished(result, error):
+    global writes_in_flight
+    writes_in_flight -= 1
+    if isinstance(error, ConflictError):
+        # The refused edits are still in the store; the merge saves them
+        # again unless the other program changed the same records
+        merge_external_change(error.change, error.token)
+    elif error:
+        messagebox.showerror("Error", f"Could not save data: {str(error)}")
+    elif result is not None:
+        # A compaction folded in other programs' edits, or found that another
+        # program had compacted first; merge their version here too
+        merge_external_change(*result)
+    update_status_bar()
+
+def append_journal(entry):
+    """Queue an edit for the next autosave instead of writing it straight away"""
+    global journal_entries
+    pending_entries.append(entry)
+    if storage.needs_compaction:
+        journal_entries += 1
+        if journal_entries >= COMPACT_THRESHOLD:
+            save_students()
+    if pending_entries:
+        schedule_autosave()
+    update_status_bar()
+
+def schedule_autosave():
+    """Restart the quiet-period timer, but never hold edits back longer than AUTOSAVE_MAX_MS"""
+    global autosave_job, dirty_since
+    now = time.monotonic()
+    if dirty_since is None:
+        dirty_since = now
+    if autosave_job:
+        root.after_cancel(autosave_job)
+    waited_ms = (now - dirty_since) * 1000
+    autosave_job = root.after(int(max(0, min(AUTOSAVE_MS, AUTOSAVE_MAX_MS - waited_ms))), autosave_due)
+
+def autosave_due():
+    global autosave_job
+    autosave_job = None
+    flush_autosave()
+
+def flush_autosave():
+    """Write every queued edit as one journal append"""
+    global autosave_job, dirty_since
+    if autosave_job:
+        root.after_cancel(autosave_job)
+        autosave_job = None
+    dirty_since = None
+    if pending_entries:
+        submit_write(storage.append, coalesce_entries(pending_entries))
+        pending_entries.clear()
+        update_status_bar()
+
+def journal_add(s):
+    append_journal(("A", s['id'], s['name'], s['cw1'], s['cw2'], s['cw3'], s['exam']))
+
+def journal_update(s):
+    append_journal(("U", s['id'], s['cw1'], s['cw2'], s['cw3'], s['exam']))
+
+def journal_delete(sid):
+    append_journal(("D", sid))
+
+def journal_record(sid):
+    """Journal a record's current state in full, or its deletion"""
+    s = students.get(sid)
+    if s is None:
+        journal_delete(sid)
+    else:
+        journal_add(s)
+
+def remember_base(sid):
+    """Keep a record's state from before its first edit since the files were last in sync"""
+    if sid not in edit_bases:
+        s = students.get(sid)
+        edit_bases[sid] = [dict(s) if s else None]
+
+def edit_base_states():
+    """Every state each edited record has had here since the files were last in sync"""
+    bases = {sid: list(states) for sid, states in syncing_bases.items()}
+    for sid, states in edit_bases.items():
+        bases.setdefault(sid, []).extend(states)
+    return bases
+
+def save_students():
+    """Compact in the background from a copy of the current records"""
+    global journal_entries
+    # Journal the queued edits first: if another program compacts before
+    # us, nothing of ours is written and only its snapshot holds them
+    flush_autosave()
+    submit_write(storage.compact, snapshot_rows(students))
+    journal_entries = 0
+
+def save_batch(entries):
+    """Write a batch edit as one journal record, so a crash keeps all of it or none"""
+    flush_autosave()
+    # Journalled first, so the batch is kept even if another program compacts before us
+    submit_write(storage.append, entries)
+    if storage.needs_compaction:
+        save_students()
+    update_status_bar()
+
+def watch_files():
+    """Poll the data files for writes by other programs"""
+    check_external_changes()
+    root.after(WATCH_MS, watch_files)
+
+def check_external_changes():
+    global checking, syncing_bases, edit_bases
+    # Wait for queued edits to reach disk so they are not mistaken for conflicts
+    if loading or checking or pending_entries:
+        return
+    checking = True
+    # Edits made from here on are judged against the next poll
+    syncing_bases, edit_bases = edit_bases, {}
+    io_worker.submit(storage.poll_changes, on_done=finish_external_check)
+
+def finish_external_check(result, error):
+    global checking, syncing_bases
+    if resolving:
+        # A conflict prompt is open; merge once it has been answered
+        root.after(100, finish_external_check, result, error)
+        return
+    if error:
+        edit_bases.update({sid: states + edit_bases.get(sid, []) for sid, states in syncing_bases.items()})
+        print(f"Could not check for external changes: {error}")
+    elif result is not None:
+        merge_external_change(*result)
+    syncing_bases = {}
+    # Cleared last so no second check starts while a conflict prompt is open
+    checking = False
+
+def merge_external_change(change, token):
+    if resolving:
+        root.after(100, merge_external_change, change, token)
+        return
+    states = external_states(students, change)
+    applied, conflicts, unsaved = merge_external(students, states, edit_base_states())
+    io_worker.submit(storage.mark_synced, token)
+    # Records the other program left alone but that are missing our edits
+    for sid in unsaved:
+        journal_record(sid)
+    if conflicts:
+        resolve_conflicts(conflicts)
+    if applied or conflicts:
+        refresh_combo()
+        if browser.visible:
+            browser.render()
+        update_status_bar()
+        status_bar.config(text=status_bar.cget("text") +
+                          f" | {len(applied) + len(conflicts)} change(s) from another program merged")
+
+def describe_version(s):
+    if s is None:
+        return "deleted"
+    return f"{s['name']}, {s['cw1']}/{s['cw2']}/{s['cw3']}, exam {s['exam']}"
+
+def resolve_conflicts(conflicts):
+    """Ask whether to keep our edits or the other program's for records both changed"""
+    global resolving
+    shown = [f"{sid}: yours {describe_version(mine)}; theirs {describe_version(theirs)}"
+             for sid, mine, theirs in conflicts[:10]]
+    if len(conflicts) > 10:
+        shown.append(f"...and {len(conflicts) - 10} more")
+    resolving = True
+    try:
+        keep_mine = messagebox.askyesno(
+            "Conflicting Changes",
+            f"{len(conflicts)} record(s) were changed here and by another program:\n\n" + "\n".join(shown) +
+            "\n\nKeep your versions? Choose No to take the other program's versions.")
+    finally:
+        resolving = False
+    for sid, mine, theirs in conflicts:
+        if not keep_mine:
+            apply_state(students, sid, theirs)
+        else:
+            # Their version is now one we have seen, so it no longer conflicts
+            edit_bases.setdefault(sid, []).append(theirs)
+            journal_record(sid)
+
+def on_close():
+    if io_worker.pending or pending_entries:
+        status_bar.config(text="Saving changes before closing...")
+        root.update_idletasks()
+    # Callbacks run while waiting can queue more edits, e.g. a merge saving
+    # the records kept in a conflict, so repeat until nothing is left
+    compacted = False
+    while True:
+        flush_autosave()
+        if journal_entries and storage.needs_compaction and not compacted:
+            save_students()
+            compacted = True
+        io_worker.wait()
+        if not pending_entries:
+            break
+    io_worker.close()
+    try:
+        metrics.dump()
+    except OSError as e:
+        print(f"Could not write command metrics: {e}")
+    root.destroy()
+
+# ---------------- Helper Functions ----------------
+def show_output(text):
+    if browser.visible:
+        browser.hide()
+        text_frame.pack(fill='both', expand=True, padx=10, pady=10)
+    output_box.config(state="normal")
+    output_box.delete("1.0", tk.END)
+    output_box.insert(tk.END, text)
+    output_box.config(state="disabled")
+
+def update_status_bar():
+    if loading:
+        return
+    avg_percent = students.aggregates.average()
+    saved = ("Unsaved changes" if pending_entries else
+             "Saving..." if writes_in_flight else "All changes saved")
+    status_bar.config(text=f"Total Students: {len(students)} | Average Percentage: {avg_percent:.1f}% | {saved}")
+
+def welcome_message():
+    text = f"""Welcome to Student Manager
+
+Loaded {len(students)} student records from file.
+
+Use the buttons to:
+• View all student records
+• Search for specific students
+• Add new students
+• Update existing records
+• Analyze class performance
+• Sort and organize data
+
+All changes are automatically saved to file.
+"""
+    if load_errors:
+        text += f"\nSkipped {len(load_errors)} malformed record(s):\n"
+        # Journal records carry their own location; data file lines have a number
+        text += "".join(f"  {DATA_FILE} line {line_no}: {reason}\n" if line_no else f"  {reason}\n"
+                        for line_no, reason in sorted(load_errors)[:20])
+        if len(load_errors) > 20:
+            text += f"  ... and {len(load_errors) - 20} more\n"
+    over = get_grading_scheme().roster_problems(students)
+    if over:
+        text += f"\n{len(over)} record(s) have marks above the grading scheme's maximums and are kept as stored:\n"
+        text += "".join(f"  {sid}: {message}\n" for sid, message in over[:20])
+        if len(over) > 20:
+            text += f"  ... and {len(over) - 20} more\n"
+    return text
+
+COMBO_MATCH_LIMIT = 30
+
+def combo_label(s):
+    return f"{s['name']} ({s['id']})"
+
+def refresh_combo(selected=None):
+    """Point the picker at one student; the drop-down list itself is filled lazily"""
+    student = selected or students.first()
+    combo_choices.clear()
+    student_combo["values"] = ()
+    if student:
+        label = combo_label(student)
+        combo_choices[label] = student['id']
+        student_combo.set(label)
+    else:
+        student_combo.set("")
+
+def update_combo_matches(event=None):
+    """Offer only the best few matches for what has been typed so far"""
+    if event is not None and event.keysym in ("Up", "Down", "Return", "Escape", "Tab"):
+        return
+    term = student_combo.get().strip()
+    if term in combo_choices:
+        return
+    if term:
+        ids, _ = students.search(term, COMBO_MATCH_LIMIT, QUICK_SEARCH_BUDGET)
+        matches = [students.get(sid) for sid in ids]
+    else:
+        matches = list(itertools.islice(students, COMBO_MATCH_LIMIT))
+    combo_choices.clear()
+    for s in matches:
+        combo_choices[combo_label(s)] = s['id']
+    student_combo["values"] = list(combo_choices)
+
+def validate_mark(subject, min_val, max_val, current_val=None):
+    if current_val is not None:
+        prompt = f"Enter {subject} mark ({min_val}-{max_val})\nCurrent: {current_val}"
+    else:
+        prompt = f"Enter {subject} mark ({min_val}-{max_val})"
+    
+    mark = simpledialog.askstring("Input Mark", prompt)
+    if mark is None:
+        return None
+    try:
+        mark_int = int(mark)
+        if min_val <= mark_int <= max_val:
+            return mark_int
+        else:
+            messagebox.showerror("Error", f"{subject} must be between {min_val} and {max_val}")
+            return None
+    except ValueError:
+        messagebox.showerror("Error", "Please enter a valid number")
+        return None
+
+def get_selected_student():
+    sel = student_combo.get()
+    if not sel:
+        messagebox.showwarning("Warning", "Please select a student first")
+        return None
+    student_id = combo_choices.get(sel) or sel.split("(")[-1].rstrip(")")
+    student = students.get(student_id)
+    if student:
+        return student
+    messagebox.showerror("Error", "Student not found")
+    return None
+
+# ---------------- Record Browser ----------------
+class RecordBrowser:
+    """Table view of the roster that only materializes the rows on screen.
+
+    The tree holds one page of reusable items; scrolling and column sorts
+    move an offset into a list of IDs and rewrite just those items.
+    """
+    ROW_HEIGHT = 22
+    COLUMNS = (
+        ("#", "#", 55), ("id", "ID", 80), ("name", "Name", 150),
+        ("cw1", "CW1", 40), ("cw2", "CW2", 40), ("cw3", "CW3", 40),
+        ("cw_total", "CW Total", 65), ("exam", "Exam", 45),
+        ("percent", "Percent", 65), ("grade", "Grade", 45),
+    )
+
+    def __init__(self, parent, store):
+        self.store = store
+        # The IDs as given to load(), which the "#" column restores
+        self.loaded = []
+        self.order = []
+        self.offset = 0
+        self.items = []
+        self.sort_field = "#"
+        self.sort_reverse = False
+        self.visible = False
+
+        self.frame = tk.Frame(parent, bg=CARD_COLOR)
+        ttk.Style().configure("Records.Treeview", rowheight=self.ROW_HEIGHT)
+        body = tk.Frame(self.frame, bg=CARD_COLOR)
+        body.pack(fill='both', expand=True, padx=10, pady=(10, 5))
+        self.tree = ttk.Treeview(body, columns=[c[0] for c in self.COLUMNS], show="headings",
+                                 style="Records.Treeview", selectmode="browse")
+        for field, title, width in self.COLUMNS:
+            self.tree.heading(field, text=title, command=lambda f=field: self.sort_by(f))
+            self.tree.column(field, width=width, minwidth=30,
+                             anchor='w' if field == "name" else 'center')
+        self.scrollbar = tk.Scrollbar(body, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.summary = tk.Label(self.frame, bg=CARD_COLOR, fg=TEXT_COLOR,
+                                font=('Arial', 10, 'bold'), anchor='w')
+        self.summary.pack(fill='x', padx=10, pady=(0, 10))
+
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1, "units"))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1, "units"))
+
+    def show(self):
+        self.visible = True
+        self.frame.pack(fill='both', expand=True)
+
+    def hide(self):
+        self.visible = False
+        self.frame.pack_forget()
+
+    def load(self, ids, summary=""):
+        """Browse these IDs; records themselves are fetched page by page"""
+        self.loaded = ids
+        self.order = list(ids)
+        self.offset = 0
+        self.sort_field, self.sort_reverse = "#", False
+        self.set_headings()
+        self.summary.config(text=summary)
+        self.render()
+
+    def on_resize(self, event):
+        header = self.ROW_HEIGHT + 4
+        rows = max(1, (event.height - header) // self.ROW_HEIGHT)
+        while len(self.items) < rows:
+            self.items.append(self.tree.insert("", tk.END, values=()))
+        while len(self.items) > rows:
+            self.tree.delete(self.items.pop())
+        self.render()
+
+    def render(self):
+        self.offset = max(0, min(self.offset, len(self.order) - len(self.items)))
+        for i, item in enumerate(self.items):
+            pos = self.offset + i
+            s = self.store.get(self.order[pos]) if pos < len(self.order) else None
+            if s is None:
+                self.tree.item(item, values=())
+            else:
+                self.tree.item(item, values=(
+                    pos + 1, s['id'], s['name'], s['cw1'], s['cw2'], s['cw3'],
+                    s['cw_total'], s['exam'], f"{s['percent']:.1f}%", s['grade']))
+        if self.order:
+            total = len(self.order)
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + len(self.items)) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll(self, amount, what):
+        step = max(1, len(self.items) - 1) if what == "pages" else 1
+        self.offset += int(amount) * step
+        self.render()
+
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self.order))
+            self.render()
+        elif args[0] == "scroll":
+            self.scroll(args[1], args[2])
+
+    def set_headings(self):
+        for field, title, width in self.COLUMNS:
+            if field == self.sort_field and field != "#":
+                title += " \u25bc" if self.sort_reverse else " \u25b2"
+            self.tree.heading(field, text=title)
+
+    def sort_by(self, field):
+        if field == self.sort_field:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_field, self.sort_reverse = field, field in ("percent", "overall", "cw_total")
+        if field == "#":
+            # Back to the order the view was loaded in, e.g. search ranking
+            self.order = [sid for sid in self.loaded if sid in self.store]
+            if self.sort_reverse:
+                self.order.reverse()
+        else:
+            get = self.store.get
+            self.order = [sid for sid in self.order if sid in self.store]
+            self.order.sort(key=lambda sid: get(sid)[field], reverse=self.sort_reverse)
+        self.offset = 0
+        self.set_headings()
+        self.render()
+
+# ---------------- Core Functionalities ----------------
+def view_all():
+    if not students:
+        show_output("No student records available.\nUse 'Add Student' to create new records.")
+        return
+    
+    text_frame.pack_forget()
+    browser.load(students.ids(),
+                 f"ALL STUDENT RECORDS  |  Total Students: {len(students)}  |  "
+                 f"Average Percentage: {students.aggregates.average():.1f}%  |  "
+                 "Click a column heading to sort")
+    browser.show()
+
+def view_individual():
+    student = get_selected_student()
+    if student:
+        text = "INDIVIDUAL STUDENT RECORD\n" + "="*50 + "\n\n"
+        text += render_student(students, student)
+        text += f"Class Rank: {students.ranking.rank_of(student)} of {len(students)}\n"
+        show_output(text)
+
+def show_highest():
+    if not students:
+        show_output("No student records available")
+        return
+    best = students.get(students.ranking.highest()[1])
+    text = "HIGHEST PERFORMING STUDENT\n" + "="*50 + "\n\n"
+    text += render_student(students, best)
+    show_output(text)
+
+def show_lowest():
+    if not students:
+        show_output("No student records available")
+        return
+    lowest = students.get(students.ranking.lowest()[1])
+    text = "LOWEST PERFORMING STUDENT\n" + "="*50 + "\n\n"
+    text += render_student(students, lowest)
+    show_output(text)
+
+def sort_records():
+    if not students:
+        show_output("No student records available")
+        return
+    
+    # The ranking is already sorted, so this only picks a direction; file order is untouched
+    descending = messagebox.askyesno("Sort Records", "Sort by percentage in descending order?")
+    direction = "highest first" if descending else "lowest first"
+    text_frame.pack_forget()
+    browser.load(list(students.ranking.iter_ids(descending)),
+                 f"RECORDS SORTED BY PERCENTAGE ({direction})  |  Total Students: {len(students)}")
+    browser.show()
+
+def add_student():
+    if still_loading():
+        return
+    sid = simpledialog.askstring("Add Student", "Enter student ID:")
+    if not sid:
+        return
+    
+    if sid in students:
+        messagebox.showerror("Error", "This student ID already exists")
+        return
+    if field_problem("Student ID", sid):
+        messagebox.showerror("Error", field_problem("Student ID", sid))
+        return
+    
+    name = simpledialog.askstring("Add Student", "Enter student name:")
+    if not name:
+        return
+    if field_problem("Name", name):
+        messagebox.showerror("Error", field_problem("Name", name))
+        return
+    
+    scheme = get_grading_scheme()
+    cw1 = validate_mark("Coursework 1", 0, scheme.maximums[0])
+    if cw1 is None: return
+    
+    cw2 = validate_mark("Coursework 2", 0, scheme.maximums[1])
+    if cw2 is None: return
+    
+    cw3 = validate_mark("Coursework 3", 0, scheme.maximums[2])
+    if cw3 is None: return
+    
+    exam = validate_mark("Exam", 0, scheme.maximums[3])
+    if exam is None: return
+
+    remember_base(sid)
+    new_student = students.add(make_student(sid, name, cw1, cw2, cw3, exam))
+    journal_add(new_student)
+    refresh_combo(new_student)
+    update_status_bar()
+    
+    text = "NEW STUDENT ADDED SUCCESSFULLY\n" + "="*50 + "\n\n"
+    text += render_student(students, new_student)
+    show_output(text)
+
+def delete_student():
+    if still_loading():
+        return
+    student = get_selected_student()
+    if not student:
+        return
+    
+    if messagebox.askyesno("Confirm Delete", f"Delete {student['name']}? This cannot be undone."):
+        remember_base(student['id'])
+        students.remove(student['id'])
+        journal_delete(student['id'])
+        refresh_combo()
+        update_status_bar()
+        show_output(f"Student {student['name']} has been deleted successfully.\nRemaining students: {len(students)}")
+
+def update_student():
+    if still_loading():
+        return
+    student = get_selected_student()
+    if not student:
+        return
+    
+    scheme = get_grading_scheme()
+    cw1 = validate_mark("Coursework 1", 0, scheme.maximums[0], student["cw1"])
+    if cw1 is None: return
+    
+    cw2 = validate_mark("Coursework 2", 0, scheme.maximums[1], student["cw2"])
+    if cw2 is None: return
+    
+    cw3 = validate_mark("Coursework 3", 0, scheme.maximums[2], student["cw3"])
+    if cw3 is None: return
+    
+    exam = validate_mark("Exam", 0, scheme.maximums[3], student["exam"])
+    if exam is None: return
+
+    remember_base(student["id"])
+    student = students.update(student["id"], cw1, cw2, cw3, exam)
+    journal_update(student)
+    refresh_combo(student)
+    update_status_bar()
+    
+    text = "STUDENT RECORD UPDATED\n" + "="*50 + "\n\n"
+    text += render_student(students, student)
+    show_output(text)
+
+def batch_edit():
+    if still_loading():
+        return
+    window = tk.Toplevel(root)
+    window.title("Batch Edit Marks")
+    window.geometry("600x560")
+    window.configure(bg=BG_COLOR)
+
+    maximums = get_grading_scheme().maximums
+    tk.Label(window, text="Paste or load rows of  id,cw1,cw2,cw3,exam  "
+                          f"(coursework 0-{max(maximums[:3])}, exam 0-{maximums[3]})",
+             font=('Arial', 10, 'bold'), bg=BG_COLOR, fg=TEXT_COLOR).pack(anchor='w', padx=10, pady=(10, 5))
+    editor = tk.Text(window, height=16, font=('Consolas', 10), bg=CARD_COLOR, fg=TEXT_COLOR)
+    editor.pack(fill='both', expand=True, padx=10)
+    editor.insert("1.0", "id,cw1,cw2,cw3,exam\n")
+
+    tk.Label(window, text="Validation report:", font=('Arial', 10, 'bold'),
+             bg=BG_COLOR, fg=TEXT_COLOR).pack(anchor='w', padx=10, pady=(10, 5))
+    report = tk.Text(window, height=8, font=('Consolas', 10), bg='#fafafa', fg=TEXT_COLOR, state="disabled")
+    report.pack(fill='x', padx=10)
+
+    def show_report(text):
+        report.config(state="normal")
+        report.delete("1.0", tk.END)
+        report.insert(tk.END, text)
+        report.config(state="disabled")
+
+    def load_csv():
+        path = filedialog.askopenfilename(parent=window, title="Load Marks",
+                                          filetypes=[("CSV files", "*.csv"), ("Text files", "*.txt"),
+                                                     ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            with open(path, "r") as f:
+                text = f.read()
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not read file: {str(e)}", parent=window)
+            return
+        editor.delete("1.0", tk.END)
+        editor.insert("1.0", text)
+
+    def apply_changes():
+        updates, errors = parse_mark_batch(editor.get("1.0", tk.END), students)
+        lines = [f"Row {row_no}: {message}" for row_no, message in errors]
+        show_report("\n".join(lines) if lines else "All rows are valid.")
+        if not updates:
+            messagebox.showwarning("Batch Edit", "There are no valid rows to apply.", parent=window)
+            return
+        prompt = f"Update marks for {len(updates)} student(s)?"
+        if errors:
+            prompt += f"\n{len(errors)} row(s) with errors will be skipped."
+        if not messagebox.askyesno("Batch Edit", prompt, parent=window):
+            return
+        for sid, *_ in updates:
+            remember_base(sid)
+        save_batch(apply_mark_batch(students, updates))
+        show_report("\n".join([f"Applied {len(updates)} update(s)."] + lines))
+        show_output("BATCH EDIT APPLIED\n" + "="*50 + "\n\n"
+                    f"Updated marks for {len(updates)} student(s).\n"
+                    f"Skipped {len(errors)} row(s) with errors.\n")
+
+    buttons = tk.Frame(window, bg=BG_COLOR)
+    buttons.pack(fill='x', padx=10, pady=10)
+    tk.Button(buttons, text="Load CSV...", font=('Arial', 10), bg=PRIMARY_COLOR, fg='white',
+              command=load_csv, width=12).pack(side='left')
+    tk.Button(buttons, text="Apply Changes", font=('Arial', 10, 'bold'), bg=SECONDARY_COLOR, fg='white',
+              command=apply_changes, width=14).pack(side='left', padx=10)
+    tk.Button(buttons, text="Close", font=('Arial', 10), bg=ACCENT_COLOR, fg='white',
+              command=window.destroy, width=10).pack(side='right')
+
+def search_student():
+    search_term = simpledialog.askstring("Search", "Enter student name or ID to search:")
+    if not search_term:
+        return
+    
+    results, _ = students.search(search_term)
+    
+    if not results:
+        show_output(f"No students found matching '{search_term}'")
+        return
+    
+    text = "".join([
+        f"SEARCH RESULTS FOR '{search_term}'\n" + "="*50 + "\n\n",
+        *(render_student(students, students.get(sid)) for sid in results),
+        f"\nFound {len(results)} matching record(s)",
+    ])
+    show_output(text)
+
+QUICK_SEARCH_LIMIT = 500
+QUICK_SEARCH_BUDGET = 0.016
+
+def quick_search(event=None):
+    """Search-as-you-type: rank at most a frame's worth of matches into the table"""
+    term = quick_search_var.get().strip()
+    if not term:
+        if browser.visible:
+            view_all()
+        return
+    results, complete = students.search(term, QUICK_SEARCH_LIMIT, QUICK_SEARCH_BUDGET)
+    summary = f"Quick search '{term}': {len(results)} match(es)"
+    if len(results) == QUICK_SEARCH_LIMIT:
+        summary += f" (showing the best {QUICK_SEARCH_LIMIT})"
+    if not complete:
+        summary += " (partial - keep typing to narrow it down)"
+    text_frame.pack_forget()
+    browser.load(results, summary)
+    browser.show()
+
+def show_statistics():
+    show_output(format_statistics(students))
+
+def export_report():
+    """Save all records, search results or the statistics to a text, CSV or JSON file"""
+    if still_loading():
+        return
+    window = tk.Toplevel(root)
+    window.title("Export Report")
+    window.configure(bg=BG_COLOR)
+    window.resizable(False, False)
+
+    report = tk.StringVar(value="records")
+    term_var = tk.StringVar(value=quick_search_var.get())
+    for value, text in (("records", "All student records"), ("search", "Search results for:"),
+                        ("statistics", "Class statistics")):
+        tk.Radiobutton(window, text=text, variable=report, value=value, bg=BG_COLOR, fg=TEXT_COLOR,
+                       font=('Arial', 10), anchor='w').pack(fill='x', padx=15, pady=(8, 0))
+        if value == "search":
+            ttk.Entry(window, textvariable=term_var, font=('Arial', 10)).pack(fill='x', padx=35)
+
+    def choose_file():
+        kind, term = report.get(), term_var.get().strip()
+        if kind == "search" and not term:
+            messagebox.showerror("Error", "Enter a name or ID to search for", parent=window)
+            return
+        path = filedialog.asksaveasfilename(
+            parent=window, title="Export Report", defaultextension=".txt",
+            filetypes=[("Text report", "*.txt"), ("CSV file", "*.csv"), ("JSON file", "*.json")])
+        if not path:
+            return
+        window.destroy()
+        # Copy what the worker needs now; the store may change while it writes
+        if kind == "statistics":
+            io_worker.submit(export_statistics, path, copy.deepcopy(students.aggregates),
+                             copy.deepcopy(students.analytics), on_done=export_finished(path))
+            return
+        if kind == "search":
+            ids, _ = students.search(term)
+            rows, title = snapshot_rows(students.get(sid) for sid in ids), f"SEARCH RESULTS FOR '{term}'"
+        else:
+            rows, title = snapshot_rows(students), "ALL STUDENT RECORDS"
+        records = (make_student(*row) for row in rows)
+        io_worker.submit(export_records, path, records, None, title, on_done=export_finished(path))
+        status_bar.config(text=f"Exporting {len(rows)} record(s) to {path}...")
+
+    tk.Button(window, text="Export...", font=('Arial', 10, 'bold'), bg=PRIMARY_COLOR, fg='white',
+              command=choose_file, width=12).pack(pady=12)
+
+def export_finished(path):
+    def done(result, error):
+        if error:
+            messagebox.showerror("Error", f"Could not export the report: {str(error)}")
+        else:
+            update_status_bar()
+            status_bar.config(text=status_bar.cget("text") + f" | Report saved to {path}")
+    return done
+
+def grading_scheme_settings():
+    """Show the grading scheme and offer to re-grade everyone with grading.json"""
+    if still_loading():
+        return
+    current = get_grading_scheme()
+    try:
+        scheme = GradingScheme.load()
+    except ValueError as e:
+        messagebox.showerror("Grading Scheme", f"Could not read the grading scheme:\n{e}")
+        return
+    if scheme.to_dict() == current.to_dict():
+        show_output(format_grading_scheme(current) + f"\n{GRADING_FILE} matches the scheme in use.")
+        return
+    show_output("NEW " + format_grading_scheme(scheme))
+    if not messagebox.askyesno("Grading Scheme",
+                               f"{GRADING_FILE} has changed. Re-grade all {len(students)} students with it?"):
+        show_output(format_grading_scheme(current))
+        return
+    try:
+        regrade_roster(students, scheme)
+    except ValueError as e:
+        messagebox.showerror("Grading Scheme", f"{e}\n\nCorrect these marks first; the current scheme stays in use.")
+        show_output(format_grading_scheme(current))
+        return
+    io_worker.submit(storage.regrade, on_done=write_finished_regrade)
+    refresh_combo()
+    if browser.visible:
+        browser.render()
+    update_status_bar()
+    show_output(format_grading_scheme(scheme) + "\n" + format_statistics(students))
+
+def write_finished_regrade(result, error):
+    if error:
+        messagebox.showerror("Error", f"Could not save the new grades: {str(error)}")
+
+def faculty_statistics():
+    global shards, summarising
+    if summarising:
+        return
+    directory = filedialog.askdirectory(title="Choose the folder of cohort marks files",
+                                        initialdir=shards.directory if shards else ".")
+    if not directory:
+        return
+    if shards is None or shards.directory != directory:
+        # Worker processes would re-run this script unless they are forked
+        workers = None if multiprocessing.get_start_method() == "fork" else 1
+        shards = ShardSet(directory, workers=workers)
+    summarising = True
+    show_output("Summarising cohort files...")
+    # Only files changed since the last visit are read again
+    io_worker.submit(shards.refresh, on_done=finish_faculty_statistics)
+
+def finish_faculty_statistics(reloaded, error):
+    global summarising
+    summarising = False
+    if error:
+        messagebox.showerror("Error", f"Problem reading cohort files: {str(error)}")
+        return
+    if not shards.summaries:
+        show_output(f"No marks files found in {shards.directory}")
+        return
+    show_output(format_shard_statistics(shards))
+
+# ---------------- GUI Setup ----------------
+metrics = CommandMetrics()
+journal_entries = 0
+# The store's aggregates and analytics are built for the scheme in force,
+# so grading.json has to be loaded before the store is made
+try:
+    set_grading_scheme(GradingScheme.load())
+    grading_error = None
+except ValueError as e:
+    grading_error = e
+students = StudentStore()
+load_errors = []
+loading = False
+shards = None
+summarising = False
+# Edited IDs mapped to their earlier states, for the three-way merge with
+# other programs' changes; syncing_bases is what the running check covers
+edit_bases = {}
+syncing_bases = {}
+checking = False
+resolving = False
+WATCH_MS = 2000
+# Edits are written once a burst has been quiet for AUTOSAVE_MS
+pending_entries = []
+autosave_job = None
+dirty_since = None
+writes_in_flight = 0
+AUTOSAVE_MS = 500
+AUTOSAVE_MAX_MS = 3000
+# Records indexed for search per idle slice once loading has finished
+SEARCH_INDEX_SLICE = 2000
+
+root = tk.Tk()
+root.title("Student Manager")
+if grading_error:
+    messagebox.showerror("Grading Scheme", f"{grading_error}\nThe default grading scheme will be used.")
+root.geometry("900x650")
+root.configure(bg='#f5f7fa')
+
+# Colors
+PRIMARY_COLOR = '#3498db'
+SECONDARY_COLOR = '#2ecc71'
+ACCENT_COLOR = '#e74c3c'
+BG_COLOR = '#f5f7fa'
+CARD_COLOR = '#ffffff'
+TEXT_COLOR = '#2c3e50'
+
+main_frame = tk.Frame(root, bg=BG_COLOR)
+main_frame.pack(fill='both', expand=True, padx=15, pady=15)
+
+header_frame = tk.Frame(main_frame, bg=PRIMARY_COLOR, height=80)
+header_frame.pack(fill='x', pady=(0, 15))
+header_frame.pack_propagate(False)
+
+tk.Label(header_frame, text="Student Manager", 
+          font=('Arial', 20, 'bold'), 
+          bg=PRIMARY_COLOR, fg='white').pack(expand=True)
+
+content_frame = tk.Frame(main_frame, bg=BG_COLOR)
+content_frame.pack(fill='both', expand=True)
+
+left_panel = tk.Frame(content_frame, bg=CARD_COLOR, relief=tk.RAISED, bd=1)
+left_panel.pack(side='left', fill='y', padx=(0, 15))
+
+right_panel = tk.Frame(content_frame, bg=BG_COLOR)
+right_panel.pack(side='right', fill='both', expand=True)
+
+tk.Label(left_panel, text="View Individual Student Record:", 
+         font=('Arial', 11, 'bold'), bg=CARD_COLOR, fg=TEXT_COLOR).pack(anchor='w', pady=(15, 5), padx=15)
+
+combo_choices = {}
+student_combo = ttk.Combobox(left_panel, width=25, font=('Arial', 10),
+                             postcommand=update_combo_matches)
+student_combo.pack(fill='x', padx=15, pady=(0, 10))
+student_combo.bind("<KeyRelease>", update_combo_matches)
+refresh_combo()
+
+tk.Button(left_panel, text="View Record", font=('Arial', 10, 'bold'), 
+          bg=PRIMARY_COLOR, fg='white', command=metrics.instrument("View Record", view_individual), width=15).pack(pady=(0, 20))
+
+nav_buttons = [
+    ("View All Student Records", view_all, PRIMARY_COLOR),
+    ("Show Highest Score", show_highest, SECONDARY_COLOR),
+    ("Show Lowest Score", show_lowest, SECONDARY_COLOR),
+]
+
+for text, command, color in nav_buttons:
+    tk.Button(left_panel, text=text, font=('Arial', 10, 'bold'),
+              bg=color, fg='white', command=metrics.instrument(text, command), width=20).pack(pady=8, padx=15)
+
+separator = tk.Frame(left_panel, height=2, bg='#e0e0e0')
+separator.pack(fill='x', pady=20, padx=10)
+
+edit_buttons = [
+    ("Add Student", add_student, SECONDARY_COLOR),
+    ("Update Student", update_student, '#f39c12'),
+    ("Delete Student", delete_student, ACCENT_COLOR),
+    ("Batch Edit Marks", batch_edit, '#e67e22'),
+    ("Search Student", search_student, PRIMARY_COLOR),
+    ("Class Statistics", show_statistics, '#9b59b6'),
+    ("Sort Records", sort_records, '#1abc9c'),
+]
+
+for text, command, color in edit_buttons:
+    tk.Button(left_panel, text=text, font=('Arial', 10),
+              bg=color, fg='white', command=metrics.instrument(text, command), width=15).pack(pady=5, padx=15)
+
+# Less frequent tasks live in a menu so the left panel fits the window
+menu_bar = tk.Menu(root)
+tools_menu = tk.Menu(menu_bar, tearoff=False)
+for text, command in (("Export Report...", export_report),
+                      ("Faculty Statistics...", faculty_statistics),
+                      ("Grading Scheme...", grading_scheme_settings)):
+    tools_menu.add_command(label=text, command=metrics.instrument(text.rstrip("."), command))
+menu_bar.add_cascade(label="Tools", menu=tools_menu)
+root.config(menu=menu_bar)
+
+output_frame = tk.Frame(right_panel, bg=CARD_COLOR, relief=tk.RAISED, bd=1)
+output_frame.pack(fill='both', expand=True)
+
+tk.Label(output_frame, text="Student Records", 
+          font=('Arial', 12, 'bold'), 
+          bg=PRIMARY_COLOR, fg='white').pack(fill='x')
+
+search_bar = tk.Frame(output_frame, bg=CARD_COLOR)
+search_bar.pack(fill='x', padx=10, pady=(10, 0))
+tk.Label(search_bar, text="Quick Search:", font=('Arial', 10, 'bold'),
+         bg=CARD_COLOR, fg=TEXT_COLOR).pack(side='left')
+quick_search_var = tk.StringVar()
+quick_search_entry = ttk.Entry(search_bar, textvariable=quick_search_var, font=('Arial', 10))
+quick_search_entry.pack(side='left', fill='x', expand=True, padx=(8, 0))
+quick_search_entry.bind("<KeyRelease>", metrics.instrument("Quick Search", quick_search))
+
+# Output Textbox with Scrollbar
+text_frame = tk.Frame(output_frame, bg=CARD_COLOR)
+text_frame.pack(fill='both', expand=True, padx=10, pady=10)
+
+output_box = tk.Text(text_frame, width=60, height=25, wrap=tk.WORD,
+                     bg='#fafafa', fg=TEXT_COLOR, font=('Consolas', 10),
+                     relief=tk.FLAT, bd=0)
+scrollbar = tk.Scrollbar(text_frame, command=output_box.yview)
+scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+output_box.pack(side='left', fill='both', expand=True)
+output_box.config(yscrollcommand=scrollbar.set)
+
+# Table view used by 'View All Student Records'
+browser = RecordBrowser(output_frame, students)
+
+# Status Bar
+status_bar = tk.Label(root, text="", 
+                     bg='#34495e', fg='white', font=('Arial', 10), anchor='w')
+status_bar.pack(fill='x', side=tk.BOTTOM)
+
+storage = open_storage()
+io_worker = IOWorker(root)
+root.protocol("WM_DELETE_WINDOW", on_close)
+# Hidden diagnostics panel
+root.bind("<Control-Shift-D>", lambda event: show_output(metrics.summary()))
+start_loading()
+root.after(WATCH_MS, watch_files)
+
+root.mainloop()
\ No newline at end of file
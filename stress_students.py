@@ -0,0 +1,221 @@
+"""Multi-process stress test for several programs sharing one set of data files.
+
+    python stress_students.py                              # 4 processes, 300 steps each
+    python stress_students.py --processes 8 --steps 1000 --students 500
+
+Every process loads the roster through TextStorage, then repeatedly edits
+marks of the students it alone owns, increments a counter record that all
+processes contend for, merges the others' changes and now and then
+compacts. Conflicts are merged the way the GUI merges them, taking the
+other program's version, and counter increments that lose are retried.
+
+Afterwards the files are read back fresh: each owned record must hold the
+last marks its owner wrote and the counter must equal the number of
+increments, so no edit was lost. Compactions must go through too: one
+may find that another program has just compacted, but at least half of
+them must write a snapshot. Exits 1 if any of this fails.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from student_core import (
+    ConflictError, TextStorage, apply_state, external_states, load_students,
+    merge_external, snapshot_rows,
+)
+
+COUNTER_ID = "COUNTER"
+
+
+def storage_paths(workdir):
+    return tuple(os.path.join(workdir, "studentMarks" + ext) for ext in (".txt", ".journal"))
+
+
+def owned_ids(index, processes, students):
+    return [f"S{i:05d}" for i in range(index, students, processes)]
+
+
+def counter_marks(count):
+    """Spread a count over the counter record's marks, which each have a small maximum"""
+    count, exam = divmod(count, 101)
+    count, cw3 = divmod(count, 21)
+    cw1, cw2 = divmod(count, 21)
+    return cw1, cw2, cw3, exam
+
+
+def counter_value(s):
+    return ((s["cw1"] * 21 + s["cw2"]) * 21 + s["cw3"]) * 101 + s["exam"]
+
+
+def write_roster(workdir, students, seed):
+    rng = random.Random(seed)
+    data_file = storage_paths(workdir)[0]
+    with open(data_file, "w") as f:
+        f.write(f"{students + 1}\n")
+        for i in range(students):
+            f.write(f"S{i:05d},Student {i},{rng.randint(0, 20)},{rng.randint(0, 20)},"
+                    f"{rng.randint(0, 20)},{rng.randint(0, 100)}\n")
+        f.write(f"{COUNTER_ID},Shared Counter,0,0,0,0\n")
+
+
+class Peer:
+    """One program's view of the shared files, merging like the GUI does"""
+
+    def __init__(self, workdir):
+        self.storage = TextStorage(*storage_paths(workdir))
+        self.data = load_students(storage=self.storage)
+        # Edited IDs mapped to their states since we were last in sync
+        self.bases = {}
+        self.stats = {"appends": 0, "refused appends": 0, "conflicts": 0, "merges": 0,
+                      "compactions": 0, "compactions done by another program": 0}
+        self.append_seconds = []
+
+    def edit(self, sid, marks):
+        """Change one record's marks; return False if our edit was not the one written"""
+        s = self.data.get(sid)
+        self.bases.setdefault(sid, []).append(dict(s))
+        self.data.update(sid, *marks)
+        return sid not in self.save([("U", sid, *marks)])
+
+    def save(self, entries):
+        """Append entries, merging and saving again whatever was refused.
+
+        Returns the IDs whose edits were dropped in the merge: either the
+        other program's version won or it already held the same values.
+        """
+        lost = set()
+        while entries:
+            start = time.perf_counter()
+            try:
+                self.storage.append(entries)
+                entries = []
+            except ConflictError as e:
+                self.stats["refused appends"] += 1
+                entries = self.merge(e.change, e.token)
+                lost |= {entry[1] for entry in e.entries} - {entry[1] for entry in entries}
+            finally:
+                self.append_seconds.append(time.perf_counter() - start)
+                self.stats["appends"] += 1
+        return lost
+
+    def merge(self, change, token):
+        """Merge a change, taking their version of conflicts; return the entries to save again"""
+        states = external_states(self.data, change)
+        applied, conflicts, unsaved = merge_external(self.data, states, self.bases)
+        for sid, mine, theirs in conflicts:
+            apply_state(self.data, sid, theirs)
+        self.storage.mark_synced(token)
+        self.stats["merges"] += 1
+        self.stats["conflicts"] += len(conflicts)
+        # Only the records still waiting to be saved need their history
+        self.bases = {sid: self.bases[sid] + [states[sid]] for sid in unsaved}
+        resave = []
+        for sid in unsaved:
+            s = self.data.get(sid)
+            resave.append(("D", sid) if s is None else
+                          ("A", sid, s["name"], s["cw1"], s["cw2"], s["cw3"], s["exam"]))
+        return resave
+
+    def poll(self):
+        result = self.storage.poll_changes()
+        if result is not None:
+            self.save(self.merge(*result))
+
+    def compact(self):
+        """Compact, merging the edits folded in or the snapshot of a program that compacted first"""
+        result = self.storage.compact(snapshot_rows(self.data))
+        if result is not None and result[0][0] == "snapshot":
+            self.stats["compactions done by another program"] += 1
+        else:
+            self.stats["compactions"] += 1
+        if result is not None:
+            self.save(self.merge(*result))
+
+
+def run_peer(job):
+    """Worker process: returns (last marks written per owned ID, counter increments, stats, append times)"""
+    workdir, index, args = job
+    rng = random.Random(args.seed * 1000 + index)
+    peer = Peer(workdir)
+    mine = owned_ids(index, args.processes, args.students)
+    written, increments = {}, 0
+    for _ in range(args.steps):
+        roll = rng.random()
+        if roll < 0.55:
+            sid = rng.choice(mine)
+            marks = (rng.randint(0, 20), rng.randint(0, 20), rng.randint(0, 20), rng.randint(0, 100))
+            peer.edit(sid, marks)
+            written[sid] = marks
+        elif roll < 0.8:
+            # Read-modify-write: retried until no other increment slipped in between
+            while not peer.edit(COUNTER_ID, counter_marks(counter_value(peer.data.get(COUNTER_ID)) + 1)):
+                pass
+            increments += 1
+        elif roll < 0.95:
+            peer.poll()
+        else:
+            peer.compact()
+    return written, increments, peer.stats, peer.append_seconds
+
+
+def check(workdir, results, args):
+    data = load_students(storage=TextStorage(*storage_paths(workdir)))
+    problems = []
+    if len(data) != args.students + 1:
+        problems.append(f"roster holds {len(data)} records, expected {args.students + 1}")
+    for written, _, _, _ in results:
+        for sid, marks in written.items():
+            s = data.get(sid)
+            found = s and (s["cw1"], s["cw2"], s["cw3"], s["exam"])
+            if found != marks:
+                problems.append(f"{sid}: expected {marks}, found {found}")
+    increments = sum(result[1] for result in results)
+    counted = counter_value(data.get(COUNTER_ID))
+    if counted != increments:
+        problems.append(f"counter is {counted} after {increments} increments")
+    return problems, increments
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stress concurrent access to the student data files")
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--steps", type=int, default=300, help="operations per process")
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        write_roster(workdir, args.students, args.seed)
+        start = time.perf_counter()
+        with multiprocessing.Pool(args.processes) as pool:
+            results = pool.map(run_peer, [(workdir, index, args) for index in range(args.processes)])
+        elapsed = time.perf_counter() - start
+        problems, increments = check(workdir, results, args)
+
+    totals = {}
+    for _, _, stats, _ in results:
+        for name, count in stats.items():
+            totals[name] = totals.get(name, 0) + count
+    append_ms = sorted(seconds * 1000 for result in results for seconds in result[3])
+    print(f"{args.processes} processes x {args.steps} steps in {elapsed:.2f}s; "
+          f"{increments} counter increments")
+    print(", ".join(f"{count} {name}" for name, count in totals.items()))
+    if append_ms:
+        print(f"append latency: median {statistics.median(append_ms):.2f} ms, "
+              f"max {append_ms[-1]:.2f} ms")
+    requested = totals["compactions"] + totals["compactions done by another program"]
+    if requested and totals["compactions"] < requested / 2:
+        problems.append(f"only {totals['compactions']} of {requested} compactions wrote a snapshot")
+    for problem in problems[:20]:
+        print(f"PROBLEM: {problem}")
+    print("FAILED" if problems else "OK: no edits lost and compactions went through")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+"""Batch command line for student marks, for runs without a display.
+
+    python student_batch.py import cohortA.txt cohortB.txt
+    python student_batch.py report cohort*.txt --output report.txt --csv grades.csv
+    python student_batch.py report              (reports on the saved roster)
+    python student_batch.py marks module_marks.csv
+    python student_batch.py stats cohort*.txt   (distributions without loading a roster)
+    python student_batch.py faculty cohorts/    (merged statistics for a folder of shards)
+    python student_batch.py --grading board.json report   (grade with another scheme)
+    python student_batch.py export search --term smith --output smith.csv
+    python student_batch.py --storage sqlite report --by-percent   (queried in SQL, never loaded)
+
+Input files use the studentMarks.txt layout: id,name,cw1,cw2,cw3,exam
+per student, after an optional first line with the record count or the
+column names. Several files are parsed in a
+process pool so a whole faculty's files use every core.
+"""
+import argparse
+import itertools
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from student_core import (
+    GRADING_FILE, REPORT_FORMATS, SHARD_PATTERN, ConflictError, ExternalChangeError, GradingScheme,
+    MarkAnalytics, ShardSet, SQLiteStorage, StudentStore,
+    apply_mark_batch, commit_mark_batch, export_records, export_search, export_statistics,
+    format_class_statistics, format_distributions, format_grading_scheme, format_shard_statistics,
+    format_statistics,
+    get_grading_scheme, iter_student_chunks, load_students, make_student,
+    open_storage, parse_mark_batch, set_grading_scheme, snapshot_rows, write_records_report,
+)
+
+
+def parse_file(path, scheme=None):
+    """Parse one marks file into plain rows; runs in a worker process"""
+    rows, errors = [], []
+    try:
+        for chunk in iter_student_chunks(path, errors=errors, scheme=scheme):
+            rows.extend((s['id'], s['name'], s['cw1'], s['cw2'], s['cw3'], s['exam']) for _, s in chunk)
+    except OSError as e:
+        errors.append((0, str(e)))
+    return path, rows, errors
+
+
+def parse_files(paths, workers=None):
+    """Yield (path, rows, errors) for each file, in the order given"""
+    if len(paths) == 1:
+        yield parse_file(paths[0])
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(parse_file, paths, itertools.repeat(get_grading_scheme()))
+
+
+def analyse_file(path, scheme=None):
+    """Stream one marks file into MarkAnalytics; runs in a worker process"""
+    analytics, errors = MarkAnalytics(scheme), []
+    try:
+        for chunk in iter_student_chunks(path, errors=errors, scheme=scheme):
+            for _, s in chunk:
+                analytics.add(s)
+    except OSError as e:
+        errors.append((0, str(e)))
+    return path, analytics, errors
+
+
+def analyse_files(paths, workers=None):
+    """Yield (path, analytics, errors) for each file, in the order given"""
+    if len(paths) == 1:
+        yield analyse_file(paths[0])
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(analyse_file, paths, itertools.repeat(get_grading_scheme()))
+
+
+def report_problems(path, errors):
+    for line_no, reason in errors:
+        where = f"{path}:{line_no}" if line_no else path
+        print(f"{where}: {reason}", file=sys.stderr)
+
+
+def report_roster(data):
+    """Warn about saved records above the grading scheme's maximums; they are kept as stored"""
+    for sid, message in get_grading_scheme().roster_problems(data):
+        print(f"saved roster: {sid}: {message} (kept as stored)", file=sys.stderr)
+
+
+def build_store(paths, workers=None):
+    """Merge every file into one store; the first file to use an ID wins"""
+    data = StudentStore()
+    for path, rows, errors in parse_files(paths, workers):
+        report_problems(path, errors)
+        for row in rows:
+            if row[0] in data:
+                print(f"{path}: duplicate student ID {row[0]} skipped", file=sys.stderr)
+            else:
+                data.add(make_student(*row))
+    return data
+
+
+def ordered_records(data, by_percent=False):
+    """The store's records in roster order or, by_percent, highest percentage first"""
+    if by_percent:
+        return (data.get(sid) for sid in data.ranking.iter_ids(descending=True))
+    return data
+
+
+def write_report(data, out, by_percent=False):
+    write_records_report(ordered_records(data, by_percent), out)
+    out.write("\n")
+    out.write(format_statistics(data))
+
+
+def write_sql_report(storage, out, by_percent=False):
+    write_records_report(storage.iter_records(by_percent), out)
+    out.write("\n")
+    out.write(format_class_statistics(*storage.statistics()))
+
+
+def write_grades_csv(data, path):
+    export_records(path, data, "csv")
+
+
+def command_import(args):
+    storage = open_storage(args.storage)
+    errors = []
+    data = load_students(errors, storage)
+    report_problems("saved roster", errors)
+    report_roster(data)
+    entries = []
+    for path, rows, errors in parse_files(args.files, args.workers):
+        report_problems(path, errors)
+        for sid, name, cw1, cw2, cw3, exam in rows:
+            if sid in data:
+                data.update(sid, cw1, cw2, cw3, exam)
+            else:
+                data.add(make_student(sid, name, cw1, cw2, cw3, exam))
+            entries.append(("A", sid, name, cw1, cw2, cw3, exam))
+    skipped = []
+    try:
+        storage.append(entries)
+    except ConflictError as e:
+        skipped = e.entries
+        print(f"Skipped {len(skipped)} record(s) another program changed during the import; "
+              "run it again to import them", file=sys.stderr)
+    if storage.needs_compaction and not skipped:
+        # If another program compacted first, its snapshot already holds the import
+        storage.compact(snapshot_rows(data))
+    print(f"Imported {len(entries) - len(skipped)} record(s); roster now holds {len(data)} students")
+    return 1 if skipped else 0
+
+
+def sql_roster(args):
+    """The SQLite storage when the saved roster can be queried in place, else None"""
+    if args.files:
+        return None
+    storage = open_storage(args.storage)
+    if not isinstance(storage, SQLiteStorage):
+        return None
+    errors = []
+    storage.prepare(errors)
+    report_problems("saved roster", errors)
+    report_roster(storage.iter_records())
+    return storage
+
+
+def load_data(args):
+    """The records named on the command line, or the saved roster if none are"""
+    if args.files:
+        return build_store(args.files, args.workers)
+    errors = []
+    data = load_students(errors, open_storage(args.storage))
+    report_problems("saved roster", errors)
+    report_roster(data)
+    return data
+
+
+def command_report(args):
+    storage = sql_roster(args)
+    if storage:
+        write, source = write_sql_report, storage
+    else:
+        write, source = write_report, load_data(args)
+    if args.output:
+        with open(args.output, "w") as out:
+            write(source, out, args.by_percent)
+    else:
+        write(source, sys.stdout, args.by_percent)
+    if args.csv:
+        if storage:
+            write_grades_csv(storage.iter_records(args.by_percent), args.csv)
+        else:
+            write_grades_csv(ordered_records(source, args.by_percent), args.csv)
+    return 0
+
+
+def command_marks(args):
+    storage = open_storage(args.storage)
+    errors = []
+    data = load_students(errors, storage)
+    report_problems("saved roster", errors)
+    report_roster(data)
+    with open(args.file, "r") as f:
+        updates, errors = parse_mark_batch(f.read(), data)
+    for row_no, message in errors:
+        print(f"{args.file}: row {row_no}: {message}", file=sys.stderr)
+    if errors and not args.skip_errors:
+        print("No changes made; fix the rows above or pass --skip-errors", file=sys.stderr)
+        return 1
+    if updates:
+        try:
+            commit_mark_batch(storage, data, apply_mark_batch(data, updates))
+        except ExternalChangeError:
+            print("Another program changed the roster while the batch was applied; "
+                  "no changes made, run it again", file=sys.stderr)
+            return 1
+    print(f"Updated marks for {len(updates)} student(s); skipped {len(errors)} row(s)")
+    return 0
+
+
+def command_stats(args):
+    if args.files:
+        # Files are streamed and never held in memory, so IDs repeated
+        # across files are counted once per file
+        analytics = MarkAnalytics()
+        for path, partial, errors in analyse_files(args.files, args.workers):
+            report_problems(path, errors)
+            analytics.merge(partial)
+    else:
+        storage = sql_roster(args)
+        analytics = storage.statistics()[1] if storage else load_data(args).analytics
+    print(f"Total Students: {analytics.count}\n")
+    print(format_distributions(analytics), end="")
+    return 0
+
+
+def command_faculty(args):
+    shards = ShardSet(args.directory, args.pattern, args.workers)
+    shards.refresh()
+    for path, line_no, reason in shards.errors():
+        report_problems(path, [(line_no, reason)])
+    if not shards.summaries:
+        print(f"No files matching {args.pattern} in {args.directory}", file=sys.stderr)
+        return 1
+    print(format_shard_statistics(shards), end="")
+    return 0
+
+
+def command_export(args):
+    storage = sql_roster(args)
+    if storage:
+        return export_sql(args, storage)
+    data = load_data(args)
+    if args.report == "statistics":
+        export_statistics(args.output, data.aggregates, data.analytics, args.format)
+        print(f"Wrote statistics for {len(data)} students to {args.output}")
+        return 0
+    if args.report == "search":
+        count = export_search(args.output, data, args.term, args.format)
+    else:
+        count = export_records(args.output, ordered_records(data, args.by_percent), args.format)
+    print(f"Wrote {count} record(s) to {args.output}")
+    return 0
+
+
+def export_sql(args, storage):
+    """command_export for a SQLite roster, answered by queries instead of a loaded store"""
+    if args.report == "statistics":
+        aggregates, analytics = storage.statistics()
+        export_statistics(args.output, aggregates, analytics, args.format)
+        print(f"Wrote statistics for {aggregates.count} students to {args.output}")
+        return 0
+    if args.report == "search":
+        count = export_records(args.output, storage.search(args.term), args.format,
+                               f"SEARCH RESULTS FOR '{args.term}'")
+    else:
+        count = export_records(args.output, storage.iter_records(args.by_percent), args.format)
+    print(f"Wrote {count} record(s) to {args.output}")
+    return 0
+
+
+def command_grading(args):
+    print(format_grading_scheme(get_grading_scheme()), end="")
+    # The SQLite backend stores grades, so bring them in line with the scheme
+    open_storage(args.storage).regrade()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import, grading and reporting for student marks")
+    parser.add_argument("--storage", choices=("text", "sqlite"), help="storage backend (default: STUDENT_STORAGE or text)")
+    parser.add_argument("--workers", type=int, help="number of parser processes (default: one per core)")
+    parser.add_argument("--grading", default=GRADING_FILE,
+                        help=f"grading scheme JSON file (default: {GRADING_FILE}, if it exists)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="merge marks files into the saved roster")
+    import_parser.add_argument("files", nargs="+")
+    import_parser.set_defaults(run=command_import)
+
+    report_parser = commands.add_parser("report", help="recompute grades and write a report")
+    report_parser.add_argument("files", nargs="*", help="marks files (default: the saved roster)")
+    report_parser.add_argument("--output", help="write the text report here instead of to stdout")
+    report_parser.add_argument("--csv", help="also write per-student grades as CSV")
+    report_parser.add_argument("--by-percent", action="store_true", help="list the highest percentage first")
+    report_parser.set_defaults(run=command_report)
+
+    marks_parser = commands.add_parser("marks", help="apply a CSV of id,cw1,cw2,cw3,exam in one write")
+    marks_parser.add_argument("file")
+    marks_parser.add_argument("--skip-errors", action="store_true",
+                              help="apply the valid rows even if some rows are invalid")
+    marks_parser.set_defaults(run=command_marks)
+
+    stats_parser = commands.add_parser("stats", help="quartiles, spread and histograms of the marks")
+    stats_parser.add_argument("files", nargs="*", help="marks files (default: the saved roster)")
+    stats_parser.set_defaults(run=command_stats)
+
+    faculty_parser = commands.add_parser("faculty", help="merged statistics for a folder of cohort files")
+    faculty_parser.add_argument("directory")
+    faculty_parser.add_argument("--pattern", default=SHARD_PATTERN,
+                                help=f"shard file names (default: {SHARD_PATTERN})")
+    faculty_parser.set_defaults(run=command_faculty)
+
+    export_parser = commands.add_parser("export", help="stream a report to a text, CSV or JSON file")
+    export_parser.add_argument("report", choices=("records", "search", "statistics"))
+    export_parser.add_argument("files", nargs="*", help="marks files (default: the saved roster)")
+    export_parser.add_argument("--output", required=True, help="file to write; .csv and .json pick the format")
+    export_parser.add_argument("--format", choices=REPORT_FORMATS, help="override the format chosen from --output")
+    export_parser.add_argument("--term", help="name or ID to search for (search reports)")
+    export_parser.add_argument("--by-percent", action="store_true",
+                               help="list the highest percentage first (records reports)")
+    export_parser.set_defaults(run=command_export)
+
+    grading_parser = commands.add_parser("grading", help="show the grading scheme; with sqlite storage, re-grade the database")
+    grading_parser.set_defaults(run=command_grading)
+
+    args = parser.parse_args(argv)
+    if args.command == "export" and args.report == "search" and not args.term:
+        parser.error("search reports need --term")
+    try:
+        set_grading_scheme(GradingScheme.load(args.grading))
+    except ValueError as e:
+        print(f"Invalid grading scheme: {e}", file=sys.stderr)
+        return 2
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
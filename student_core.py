@@ -0,0 +1,1817 @@
+"""Headless student records core: record model, grading, indexes, storage and reports.
+
+Nothing here touches Tk, so it can be imported by the GUI in exercise3.py,
+by the batch command line in student_batch.py, or by any other script.
+"""
+import bisect
+import csv
+import glob
+import heapq
+import io
+import itertools
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+# Advisory file locks: fcntl on POSIX, msvcrt on Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# ---------------- Grading Scheme ----------------
+GRADING_FILE = "grading.json"
+# The highest maximum mark a grading scheme may set
+MAX_MARK = 255
+
+class GradingScheme:
+    """Grade boundaries, component weights and maximum marks.
+
+    grading.json may override any part of the default scheme:
+
+        {"maximums": {"cw1": 20, "cw2": 20, "cw3": 20, "exam": 100},
+         "weights": {"cw1": 1, "cw2": 1, "cw3": 1, "exam": 1},
+         "boundaries": {"A": 70, "B": 60, "C": 50, "D": 40},
+         "fail": "F"}
+
+    Each table is merged letter by letter or component by component with
+    the defaults, so {"boundaries": {"A": 75}} only moves A; give a grade
+    null to remove it, e.g. {"boundaries": {"D": null}}.
+
+    A boundary is the lowest percentage that earns that grade. The overall
+    mark is the weighted sum of the components, so weights are whole
+    numbers; marks are stored in one byte, so maximums are at most 255.
+    """
+    COMPONENTS = (("cw1", "Coursework 1"), ("cw2", "Coursework 2"),
+                  ("cw3", "Coursework 3"), ("exam", "Exam"))
+    DEFAULTS = {
+        "maximums": {"cw1": 20, "cw2": 20, "cw3": 20, "exam": 100},
+        "weights": {"cw1": 1, "cw2": 1, "cw3": 1, "exam": 1},
+        "boundaries": {"A": 70, "B": 60, "C": 50, "D": 40},
+        "fail": "F",
+    }
+
+    def __init__(self, config=None):
+        config = dict(self.DEFAULTS, **(config or {}))
+        fields = [field for field, label in self.COMPONENTS]
+        for key in ("maximums", "weights"):
+            unknown = set(config[key]) - set(fields)
+            if unknown:
+                raise ValueError(f"unknown mark component(s) in {key}: {', '.join(sorted(unknown))}")
+        maximums = dict(self.DEFAULTS["maximums"], **config["maximums"])
+        weights = dict(self.DEFAULTS["weights"], **config["weights"])
+        if not all(isinstance(m, int) and 1 <= m <= MAX_MARK for m in maximums.values()):
+            raise ValueError("maximum marks must be whole numbers from 1 to 255")
+        if not all(isinstance(w, int) and w >= 0 for w in weights.values()) or not any(weights.values()):
+            raise ValueError("weights must be whole numbers of at least 0, and not all 0")
+        boundaries = dict(self.DEFAULTS["boundaries"], **config["boundaries"])
+        boundaries = sorted((percent, letter) for letter, percent in boundaries.items() if percent is not None)
+        if not all(isinstance(p, (int, float)) and 0 < p <= 100 for p, letter in boundaries):
+            raise ValueError("grade boundaries must be percentages above 0 and at most 100")
+        letters = [config["fail"]] + [letter for p, letter in boundaries]
+        if not all(isinstance(letter, str) and letter for letter in letters):
+            raise ValueError("grade letters must be non-empty text")
+        if len(set(p for p, letter in boundaries)) != len(boundaries) or len(set(letters)) != len(letters):
+            raise ValueError("every grade needs its own letter and its own boundary")
+        self.maximums = tuple(maximums[f] for f in fields)
+        self.weights = tuple(weights[f] for f in fields)
+        self.boundaries = tuple(p for p, letter in boundaries)
+        self.letters = tuple(letters)
+        self.total = sum(w * m for w, m in zip(self.weights, self.maximums))
+        self.limits = tuple((field, label, maximum)
+                            for (field, label), maximum in zip(self.COMPONENTS, self.maximums))
+
+    @classmethod
+    def load(cls, path=GRADING_FILE):
+        """Read a scheme from a JSON file; a missing file means the default scheme"""
+        try:
+            with open(path, "r") as f:
+                config = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}")
+        try:
+            return cls(config)
+        except (ValueError, TypeError, AttributeError) as e:
+            raise ValueError(f"{path}: {e}")
+
+    def to_dict(self):
+        fields = [field for field, label in self.COMPONENTS]
+        return {
+            "maximums": dict(zip(fields, self.maximums)),
+            "weights": dict(zip(fields, self.weights)),
+            "boundaries": dict(zip(self.letters[1:], self.boundaries)),
+            "fail": self.letters[0],
+        }
+
+    def overall(self, cw1, cw2, cw3, exam):
+        w1, w2, w3, w4 = self.weights
+        return w1 * cw1 + w2 * cw2 + w3 * cw3 + w4 * exam
+
+    def grade(self, percent):
+        return self.letters[bisect.bisect_right(self.boundaries, percent)]
+
+    def mark_problems(self, marks):
+        """One message per mark outside 0..maximum for its component"""
+        return [f"{label} must be between 0 and {maximum}"
+                for (field, label, maximum), mark in zip(self.limits, marks) if not 0 <= mark <= maximum]
+
+    def roster_problems(self, records):
+        """(id, message) for every stored record with marks above this scheme's maximums"""
+        found = []
+        for s in records:
+            problems = self.mark_problems((s["cw1"], s["cw2"], s["cw3"], s["exam"]))
+            if problems:
+                found.append((s["id"], "; ".join(problems)))
+        return found
+
+# The scheme every record is graded with; change it with set_grading_scheme()
+grading_scheme = GradingScheme()
+
+def get_grading_scheme():
+    return grading_scheme
+
+def set_grading_scheme(scheme):
+    global grading_scheme
+    grading_scheme = scheme
+
+# ---------------- Student Store ----------------
+def make_student(sid, name, cw1, cw2, cw3, exam, scheme=None):
+    scheme = scheme or grading_scheme
+    overall = scheme.overall(cw1, cw2, cw3, exam)
+    percent = (overall / scheme.total) * 100
+    return {
+        "id": sid, "name": name,
+        "cw1": cw1, "cw2": cw2, "cw3": cw3, "exam": exam,
+        "cw_total": cw1 + cw2 + cw3, "overall": overall,
+        "percent": percent, "grade": scheme.grade(percent)
+    }
+
+class ClassAggregates:
+    """Class-wide totals kept current by the store on every add, update and delete"""
+    def __init__(self, scheme=None):
+        self.scheme = scheme or grading_scheme
+        self.count = 0
+        self.total_overall = 0
+        self.grade_counts = {grade: 0 for grade in reversed(self.scheme.letters)}
+
+    def add(self, s):
+        self.count += 1
+        self.total_overall += s["overall"]
+        self.grade_counts[s["grade"]] += 1
+
+    def remove(self, s):
+        self.count -= 1
+        self.total_overall -= s["overall"]
+        self.grade_counts[s["grade"]] -= 1
+
+    def merge(self, other):
+        """Fold another cohort's totals into these"""
+        self.count += other.count
+        self.total_overall += other.total_overall
+        for grade, count in other.grade_counts.items():
+            self.grade_counts[grade] += count
+        return self
+
+    def average(self):
+        return (self.total_overall / self.count / self.scheme.total) * 100 if self.count else 0
+
+class MarkAnalytics:
+    """Mark distributions built in one pass, with no sorted copy of the cohort.
+
+    Marks are whole numbers in a small range, so a count per possible mark
+    gives exact quantiles and histograms, and running sums of marks and of
+    their squares give the mean and standard deviation. Partial results
+    from separate files or processes can be merged.
+    """
+    def __init__(self, scheme=None):
+        scheme = scheme or grading_scheme
+        self.total = scheme.total
+        self.fields = scheme.limits + (("overall", "Overall", scheme.total),)
+        self.count = 0
+        self.counts = {field: [0] * (maximum + 1) for field, label, maximum in self.fields}
+        self.sums = {field: 0 for field, label, maximum in self.fields}
+        self.squares = {field: 0 for field, label, maximum in self.fields}
+
+    def add(self, s):
+        self.count += 1
+        for field, label, maximum in self.fields:
+            mark = s[field]
+            counts = self.counts[field]
+            if mark >= len(counts):
+                # A stored record above a lowered maximum still counts
+                counts.extend([0] * (mark + 1 - len(counts)))
+            counts[mark] += 1
+            self.sums[field] += mark
+            self.squares[field] += mark * mark
+
+    def add_mark_counts(self, field, counts):
+        """Fold in (mark, number of students) pairs for one field; the caller sets count"""
+        table = self.counts[field]
+        for mark, n in counts:
+            if mark >= len(table):
+                table.extend([0] * (mark + 1 - len(table)))
+            table[mark] += n
+            self.sums[field] += mark * n
+            self.squares[field] += mark * mark * n
+
+    def remove(self, s):
+        self.count -= 1
+        for field, label, maximum in self.fields:
+            mark = s[field]
+            self.counts[field][mark] -= 1
+            self.sums[field] -= mark
+            self.squares[field] -= mark * mark
+
+    def merge(self, other):
+        """Fold another partial result into this one"""
+        self.count += other.count
+        for field, label, maximum in self.fields:
+            counts = self.counts[field]
+            if len(other.counts[field]) > len(counts):
+                counts.extend([0] * (len(other.counts[field]) - len(counts)))
+            for mark, n in enumerate(other.counts[field]):
+                counts[mark] += n
+            self.sums[field] += other.sums[field]
+            self.squares[field] += other.squares[field]
+        return self
+
+    def mean(self, field="overall"):
+        return self.sums[field] / self.count if self.count else 0
+
+    def stdev(self, field="overall"):
+        """Population standard deviation, from exact integer sums"""
+        if not self.count:
+            return 0
+        spread = self.count * self.squares[field] - self.sums[field] ** 2
+        return math.sqrt(spread) / self.count
+
+    def _mark_at(self, field, k):
+        # The k-th smallest mark (0-based), found by walking the counts
+        seen = 0
+        for mark, n in enumerate(self.counts[field]):
+            seen += n
+            if seen > k:
+                return mark
+        raise IndexError(k)
+
+    def quantile(self, q, field="overall"):
+        """Mark at fraction q of the way through the cohort, interpolating
+        between neighbours like statistics.median does for q=0.5"""
+        if not self.count:
+            return 0
+        position = (self.count - 1) * q
+        below = int(position)
+        low = self._mark_at(field, below)
+        if position == below:
+            return low
+        return low + (self._mark_at(field, below + 1) - low) * (position - below)
+
+    def quartiles(self, field="overall"):
+        return tuple(self.quantile(q, field) for q in (0.25, 0.5, 0.75))
+
+    def lowest(self, field="overall"):
+        return self._mark_at(field, 0) if self.count else 0
+
+    def highest(self, field="overall"):
+        return self._mark_at(field, self.count - 1) if self.count else 0
+
+    def histogram(self, field="overall", width=None):
+        """Counts in fixed-width bins of marks: a list of (low, high, count).
+
+        The default width gives ten bins; the last bin includes the maximum.
+        """
+        counts = self.counts[field]
+        maximum = len(counts) - 1
+        width = width or max(1, maximum // 10)
+        bins = []
+        for low in range(0, maximum + 1, width):
+            high = min(low + width - 1, maximum)
+            if high + 1 == maximum:
+                high = maximum
+            bins.append((low, high, sum(counts[low:high + 1])))
+            if high == maximum:
+                break
+        return bins
+
+def analyse(records, scheme=None):
+    """Build MarkAnalytics from any iterable of records in a single pass"""
+    analytics = MarkAnalytics(scheme)
+    for s in records:
+        analytics.add(s)
+    return analytics
+
+class RankIndex:
+    """Students ordered by (percent, id), kept current by the store.
+
+    Keys live in a list of sorted buckets of at most 2 * LOAD keys, so an
+    insert or delete only shifts one bucket. A Fenwick tree over the bucket
+    sizes turns a position into a bucket and back in O(log N); it is
+    rebuilt, in O(N / LOAD), only after a bucket is split or emptied.
+    """
+    LOAD = 1000
+
+    def __init__(self):
+        self._buckets = []
+        self._maxes = []
+        self._len = 0
+        self._index = None
+
+    def __len__(self):
+        return self._len
+
+    def add(self, s):
+        key = (s["percent"], s["id"])
+        self._len += 1
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._index = None
+            return
+        i = bisect.bisect_left(self._maxes, key)
+        if i == len(self._buckets):
+            i -= 1
+            self._buckets[i].append(key)
+            self._maxes[i] = key
+        else:
+            bisect.insort(self._buckets[i], key)
+        bucket = self._buckets[i]
+        if len(bucket) > 2 * self.LOAD:
+            upper = bucket[self.LOAD:]
+            del bucket[self.LOAD:]
+            self._buckets.insert(i + 1, upper)
+            self._maxes[i] = bucket[-1]
+            self._maxes.insert(i + 1, upper[-1])
+            self._index = None
+        else:
+            self._resize(i, 1)
+
+    def rebuild(self, records):
+        """Replace the contents with these records in one sort"""
+        keys = sorted((s["percent"], s["id"]) for s in records)
+        self._buckets = [keys[i:i + self.LOAD] for i in range(0, len(keys), self.LOAD)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._len = len(keys)
+        self._index = None
+
+    def remove(self, s):
+        key = (s["percent"], s["id"])
+        i = bisect.bisect_left(self._maxes, key)
+        bucket = self._buckets[i]
+        j = bisect.bisect_left(bucket, key)
+        del bucket[j]
+        self._len -= 1
+        if not bucket:
+            del self._buckets[i]
+            del self._maxes[i]
+            self._index = None
+            return
+        if j == len(bucket):
+            self._maxes[i] = bucket[-1]
+        self._resize(i, -1)
+
+    def _build_index(self):
+        tree = [len(bucket) for bucket in self._buckets]
+        for i in range(len(tree)):
+            parent = i | (i + 1)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._index = tree
+        return tree
+
+    def _resize(self, i, delta):
+        """Record that bucket i has grown or shrunk by delta keys"""
+        tree = self._index
+        if tree is None:
+            return
+        while i < len(tree):
+            tree[i] += delta
+            i |= i + 1
+
+    def _count_below(self, key):
+        i = bisect.bisect_left(self._maxes, key)
+        if i == len(self._buckets):
+            return self._len
+        tree = self._index or self._build_index()
+        # Sum the sizes of buckets[:i]
+        count, end = 0, i
+        while end:
+            count += tree[end - 1]
+            end &= end - 1
+        return count + bisect.bisect_left(self._buckets[i], key)
+
+    def _key_at(self, pos):
+        if not 0 <= pos < self._len:
+            raise IndexError("rank index position out of range")
+        tree = self._index or self._build_index()
+        # Descend the tree to the last bucket starting at or before pos
+        i, step = 0, 1 << (len(tree).bit_length() - 1)
+        while step:
+            if i + step <= len(tree) and tree[i + step - 1] <= pos:
+                i += step
+                pos -= tree[i - 1]
+            step >>= 1
+        return self._buckets[i][pos]
+
+    def lowest(self):
+        """Return (percent, id) of the lowest scoring student, or None"""
+        return self._buckets[0][0] if self._buckets else None
+
+    def highest(self):
+        """Return (percent, id) of the highest scoring student, or None"""
+        return self._buckets[-1][-1] if self._buckets else None
+
+    def rank_of(self, s):
+        """Class position counting from the top; equal percentages share a rank"""
+        at_or_below = self._count_below((math.nextafter(s["percent"], math.inf),))
+        return self._len - at_or_below + 1
+
+    def percentile(self, p):
+        """Nearest-rank percentile of the percentages, for p from 0 to 100"""
+        if not self._len:
+            return None
+        pos = max(0, math.ceil(p / 100 * self._len) - 1)
+        return self._key_at(min(pos, self._len - 1))[0]
+
+    def median(self):
+        if not self._len:
+            return None
+        mid = self._len // 2
+        if self._len % 2:
+            return self._key_at(mid)[0]
+        return (self._key_at(mid - 1)[0] + self._key_at(mid)[0]) / 2
+
+    def iter_ids(self, descending=False):
+        """Yield student IDs from lowest to highest percentage, or the reverse"""
+        if descending:
+            for bucket in reversed(self._buckets):
+                for key in reversed(bucket):
+                    yield key[1]
+        else:
+            for bucket in self._buckets:
+                for key in bucket:
+                    yield key[1]
+
+    def top(self, k):
+        return list(itertools.islice(self.iter_ids(descending=True), k))
+
+    def bottom(self, k):
+        return list(itertools.islice(self.iter_ids(), k))
+
+class SearchIndex:
+    """Trigram index over student names and IDs, kept current by the store.
+
+    Keys are padded with boundary markers so that every one- or two-character
+    query is also contained in at least one indexed trigram. Nothing is
+    indexed while a roster loads: the first search, or build() called a
+    slice at a time when the program is idle, indexes what source() yields.
+    """
+    def __init__(self, source):
+        self._source = source
+        self._grams = {}
+        self._keys = {}
+        # IDs mapped to names still to be indexed; None until building starts
+        self._pending = None
+
+    @staticmethod
+    def _trigrams(text):
+        return {text[i:i + 3] for i in range(len(text) - 2)}
+
+    def _padded_grams(self, sid, name):
+        return self._trigrams(f"\x02{name.lower()}\x03") | self._trigrams(f"\x02{sid.lower()}\x03")
+
+    def build(self, limit=None):
+        """Index up to limit of the records not indexed yet; return True once all are"""
+        if self._pending is None:
+            self._pending = dict(self._source())
+        while self._pending and (limit is None or limit > 0):
+            self._insert(*self._pending.popitem())
+            if limit is not None:
+                limit -= 1
+        return not self._pending
+
+    def add(self, sid, name):
+        if self._pending is not None:
+            self._insert(sid, name)
+
+    def remove(self, sid, name):
+        if self._pending is None:
+            return
+        if self._pending.pop(sid, None) is None:
+            self._delete(sid, name)
+
+    def _insert(self, sid, name):
+        self._keys[sid] = (sid.lower(), name.lower())
+        for gram in self._padded_grams(sid, name):
+            self._grams.setdefault(gram, set()).add(sid)
+
+    def _delete(self, sid, name):
+        del self._keys[sid]
+        for gram in self._padded_grams(sid, name):
+            ids = self._grams[gram]
+            ids.discard(sid)
+            if not ids:
+                del self._grams[gram]
+
+    def _candidates(self, term):
+        if len(term) >= 3:
+            sets = sorted((self._grams.get(g, set()) for g in self._trigrams(term)), key=len)
+            return set.intersection(*sets) if sets[0] else set()
+        return self._short_candidates(term)
+
+    def _short_candidates(self, term):
+        # Generated lazily so that a search with a time budget can stop part way
+        seen = set()
+        for gram, ids in self._grams.items():
+            if term in gram:
+                for sid in ids:
+                    if sid not in seen:
+                        seen.add(sid)
+                        yield sid
+
+    def _rank(self, term, sid):
+        """Lower is better: exact ID, ID prefix, name prefix, word start, anywhere"""
+        key_id, key_name = self._keys[sid]
+        if key_id == term:
+            return 0
+        if key_id.startswith(term):
+            return 1
+        if key_name.startswith(term):
+            return 2
+        if f" {term}" in key_name:
+            return 3
+        if term in key_name or term in key_id:
+            return 4
+        return None
+
+    def search(self, term, limit=None, budget=None):
+        """Return (ranked IDs, complete) for a case-insensitive substring search.
+
+        With a time budget in seconds, ranking stops early once it is spent
+        and complete is False.
+        """
+        term = term.lower()
+        if not term:
+            return [], True
+        self.build()
+        # Leave a quarter of the budget for picking the best matches at the end
+        deadline = None if budget is None else time.perf_counter() + budget * 0.75
+        complete = True
+        matches = []
+        for n, sid in enumerate(self._candidates(term)):
+            if deadline is not None and n % 64 == 0 and time.perf_counter() > deadline:
+                complete = False
+                break
+            rank = self._rank(term, sid)
+            if rank is not None:
+                matches.append((rank, self._keys[sid][1], sid))
+        if limit is not None:
+            matches = heapq.nsmallest(limit, matches)
+        else:
+            matches.sort()
+        return [sid for rank, name, sid in matches], complete
+
+# Shared by every store, so (id, version) never repeats even across stores
+_version_clock = itertools.count(1)
+
+class StudentStore:
+    """Student records kept in file order with a hash index by ID and by name"""
+    def __init__(self, records=()):
+        self._by_id = {}
+        self._by_name = {}
+        self.aggregates = ClassAggregates()
+        self.analytics = MarkAnalytics()
+        self.ranking = RankIndex()
+        self.search_index = SearchIndex(self._id_names)
+        self._versions = {}
+        for s in records:
+            self.add(s)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __contains__(self, sid):
+        return sid in self._by_id
+
+    def get(self, sid):
+        """Return the record with this ID, or None"""
+        return self._by_id.get(sid)
+
+    def first(self):
+        """Return the first record in display order, or None"""
+        return next(iter(self._by_id.values()), None)
+
+    def ids(self):
+        """Return the student IDs in display order"""
+        return list(self._by_id)
+
+    def find_by_name(self, name):
+        """Return every record whose name matches exactly (ignoring case)"""
+        return [self.get(sid) for sid in self._by_name.get(name.lower(), ())]
+
+    def search(self, term, limit=None, budget=None):
+        """Substring search over names and IDs, best matches first"""
+        return self.search_index.search(term, limit, budget)
+
+    def version(self, sid):
+        """Change counter for one record; it is new after every add or update"""
+        return self._versions.get(sid)
+
+    def _track(self, student):
+        self.aggregates.add(student)
+        self.analytics.add(student)
+        self.ranking.add(student)
+        self._versions[student["id"]] = next(_version_clock)
+
+    def _untrack(self, student):
+        self.aggregates.remove(student)
+        self.analytics.remove(student)
+        self.ranking.remove(student)
+        self._versions.pop(student["id"], None)
+
+    def _id_names(self):
+        return ((sid, s["name"]) for sid, s in self._by_id.items())
+
+    def _index_name(self, sid, name):
+        # Dicts keep insertion order, so they double as ordered sets of IDs
+        self._by_name.setdefault(name.lower(), {})[sid] = None
+        self.search_index.add(sid, name)
+
+    def _unindex_name(self, sid, name):
+        self.search_index.remove(sid, name)
+        key = name.lower()
+        ids = self._by_name[key]
+        del ids[sid]
+        if not ids:
+            del self._by_name[key]
+
+    def add(self, student):
+        sid = student["id"]
+        if sid in self._by_id:
+            raise ValueError(f"Duplicate student ID: {sid}")
+        self._by_id[sid] = student
+        self._index_name(sid, student["name"])
+        self._track(student)
+        return student
+
+    def update(self, sid, cw1, cw2, cw3, exam):
+        student = self._by_id[sid]
+        self._untrack(student)
+        student.update(make_student(sid, student["name"], cw1, cw2, cw3, exam))
+        self._track(student)
+        return student
+
+    def regrade(self):
+        """Re-grade every record under the current grading scheme and rebuild the totals"""
+        for s in self._by_id.values():
+            s.update(make_student(s["id"], s["name"], s["cw1"], s["cw2"], s["cw3"], s["exam"]))
+        self._retrack()
+
+    def _retrack(self):
+        self.aggregates = ClassAggregates()
+        self.analytics = MarkAnalytics()
+        for s in self:
+            self.aggregates.add(s)
+            self.analytics.add(s)
+            # New versions, so cached report text for the old grades is never used
+            self._versions[s["id"]] = next(_version_clock)
+        self.ranking.rebuild(self)
+
+    def remove(self, sid):
+        student = self._by_id.pop(sid)
+        self._unindex_name(sid, student["name"])
+        self._untrack(student)
+        return student
+
+def regrade_roster(data, scheme):
+    """Switch to a new grading scheme and re-grade the whole roster in one pass.
+
+    Raises ValueError, leaving the current scheme in place, if any stored
+    record has marks above the new scheme's maximums.
+    """
+    problems = scheme.roster_problems(data)
+    if problems:
+        shown = [f"{sid}: {message}" for sid, message in problems[:10]]
+        if len(problems) > 10:
+            shown.append(f"...and {len(problems) - 10} more")
+        raise ValueError(f"{len(problems)} record(s) have marks above the new maximums:\n" + "\n".join(shown))
+    set_grading_scheme(scheme)
+    data.regrade()
+
+# ---------------- Load and Save Data ----------------
+# studentMarks.txt is the last compacted snapshot; every edit since then is
+# appended to the journal and replayed on top of it at load time.
+DATA_FILE = "studentMarks.txt"
+JOURNAL_FILE = "studentMarks.journal"
+LOCK_FILE = "studentMarks.lock"
+COMPACT_THRESHOLD = 500
+
+LOAD_CHUNK_SIZE = 2000
+
+def parse_student_line(line, scheme=None, stored=False):
+    """Split one data line into (id, name, cw1, cw2, cw3, exam), raising ValueError if it is malformed.
+
+    New input must fit the scheme's maximums. Stored records (stored=True)
+    only need to fit a byte, so lowering a maximum never drops them.
+    """
+    parts = line.rstrip("\r\n").split(",")
+    if len(parts) < 6:
+        raise ValueError(f"expected 6 fields, found {len(parts)}")
+    sid, name = parts[0], parts[1]
+    if not sid or not name:
+        raise ValueError("missing student ID or name")
+    try:
+        cw1, cw2, cw3, exam = int(parts[2]), int(parts[3]), int(parts[4]), int(parts[5])
+    except ValueError:
+        raise ValueError("marks must be whole numbers")
+    check_student(sid, name, (cw1, cw2, cw3, exam), scheme, stored)
+    return sid, name, cw1, cw2, cw3, exam
+
+def field_problem(label, value):
+    """Why an ID or name cannot be stored in the comma-separated files, or None"""
+    if any(c in value for c in ",\r\n"):
+        return f"{label} cannot contain commas or line breaks"
+    return None
+
+def check_student(sid, name, marks, scheme=None, stored=False):
+    """Raise ValueError if a record's ID, name or marks are not acceptable (see parse_student_line)"""
+    if not sid or not name:
+        raise ValueError("missing student ID or name")
+    problem = field_problem("student ID", sid) or field_problem("name", name)
+    if problem:
+        raise ValueError(problem)
+    if stored:
+        problems = [] if all(0 <= m <= MAX_MARK for m in marks) else [f"marks must be between 0 and {MAX_MARK}"]
+    else:
+        problems = (scheme or grading_scheme).mark_problems(marks)
+    if problems:
+        raise ValueError("; ".join(problems))
+
+# First fields that mark a column header row rather than a student
+HEADER_IDS = ("id", "student id")
+
+def is_header_line(line):
+    """True for a leading record count, as studentMarks.txt has, or a column header row"""
+    return line.strip().isdigit() or line.split(",")[0].strip().lower() in HEADER_IDS
+
+def iter_student_chunks(path=DATA_FILE, chunk_size=LOAD_CHUNK_SIZE, errors=None, scheme=None, stored=False):
+    """Stream the data file, yielding lists of (line number, record) pairs.
+
+    A first line holding the record count or column names is skipped; any
+    other first line is read as a student. Only one chunk is held in memory
+    at a time. Malformed lines are skipped and, when an errors list is
+    given, reported there as (line number, reason).
+    Worker processes pass the scheme explicitly, as they may not share ours.
+    stored=True reads the saved roster, see parse_student_line().
+    """
+    chunk = []
+    with open(path, "r") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip() or line_no == 1 and is_header_line(line):
+                continue
+            try:
+                chunk.append((line_no, make_student(*parse_student_line(line, scheme, stored), scheme)))
+            except ValueError as e:
+                if errors is not None:
+                    errors.append((line_no, str(e)))
+                continue
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def add_loaded_chunk(data, chunk, errors=None):
+    for line_no, s in chunk:
+        if s["id"] in data:
+            if errors is not None:
+                errors.append((line_no, f"duplicate student ID {s['id']}"))
+        else:
+            data.add(s)
+
+def load_students(errors=None, storage=None):
+    """Load the whole roster synchronously, replaying any journalled edits"""
+    storage = storage or open_storage()
+    data = StudentStore()
+    try:
+        for chunk in storage.iter_chunks(errors):
+            add_loaded_chunk(data, chunk, errors)
+    except FileNotFoundError:
+        print("Note: studentMarks.txt will be created when you add first student")
+    replay_journal(data, storage.read_changes(), errors)
+    return data
+
+# Fields per journal record: A,id,name,4 marks / U,id,4 marks / D,id
+JOURNAL_FIELDS = {"A": 7, "U": 6, "D": 2}
+# An append of several records is one line, B followed by their fields, so
+# like any torn line a batch cut short by a crash is dropped whole
+BATCH_OP = "B"
+
+def apply_journal_entry(data, parts):
+    """Apply one journal record; replaying a record twice has no further effect.
+
+    Raises ValueError if the record is malformed.
+    """
+    op = parts[0]
+    if op == BATCH_OP:
+        raise ValueError("batch record does not split into whole records")
+    if op not in JOURNAL_FIELDS:
+        raise ValueError(f"unknown journal operation {op!r}")
+    if len(parts) != JOURNAL_FIELDS[op]:
+        raise ValueError(f"expected {JOURNAL_FIELDS[op]} fields, found {len(parts)}")
+    sid = parts[1]
+    try:
+        marks = [int(m) for m in parts[2:][-4:]] if op != "D" else []
+    except ValueError:
+        raise ValueError("marks must be whole numbers")
+    if op == "A":
+        if sid in data:
+            data.update(sid, *marks)
+        else:
+            data.add(make_student(sid, parts[2], *marks))
+    elif op == "U" and sid in data:
+        data.update(sid, *marks)
+    elif op == "D" and sid in data:
+        data.remove(sid)
+
+def read_journal(path=JOURNAL_FILE):
+    """Return the journal records as lists of fields, oldest first"""
+    return read_journal_tail(path)[0]
+
+def read_journal_tail(path=JOURNAL_FILE, offset=0):
+    """Return (records, end offset) for the complete lines after a byte offset"""
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            tail = f.read()
+    except FileNotFoundError:
+        return [], 0
+    # A torn final line from a crash mid-append is simply skipped
+    complete = tail[:tail.rfind(b"\n") + 1]
+    entries = []
+    for line in complete.split(b"\n")[:-1]:
+        parts = line.decode().rstrip("\r").split(",")
+        if parts[0] == BATCH_OP:
+            entries.extend(split_batch(parts))
+        else:
+            entries.append(parts)
+    return entries, offset + len(complete)
+
+def split_batch(parts):
+    """The records packed into one batch line, or the line itself if it does not split cleanly"""
+    records, i = [], 1
+    while i < len(parts):
+        size = JOURNAL_FIELDS.get(parts[i])
+        if size is None or i + size > len(parts):
+            return [parts]
+        records.append(parts[i:i + size])
+        i += size
+    return records
+
+def replay_journal(data, entries=None, errors=None):
+    """Apply journal records to the store and return how many were applied.
+
+    Records that cannot be replayed are skipped and, when an errors list
+    is given, reported there like the loader's malformed lines.
+    """
+    count = 0
+    for record_no, parts in enumerate(read_journal() if entries is None else entries, 1):
+        try:
+            apply_journal_entry(data, parts)
+        except (ValueError, IndexError) as e:
+            if errors is not None:
+                errors.append((0, f"{JOURNAL_FILE} record {record_no}: {e}"))
+            continue
+        count += 1
+    return count
+
+def _replay_states(states, entries, fallback):
+    for parts in entries:
+        op, sid = parts[0], parts[1]
+        current = states[sid] if sid in states else fallback(sid)
+        try:
+            if op == "A" and len(parts) == 7:
+                name = current["name"] if current else parts[2]
+                states[sid] = make_student(sid, name, *[int(m) for m in parts[3:7]])
+            elif op == "U" and len(parts) == 6 and current:
+                states[sid] = make_student(sid, current["name"], *[int(m) for m in parts[2:6]])
+            elif op == "D" and current:
+                states[sid] = None
+        except (ValueError, IndexError):
+            continue
+
+def external_states(data, change):
+    """Map every ID an external change touches to its new record, or None if deleted.
+
+    change is the first half of what a storage's poll_changes() returns:
+    ("entries", journal records) or ("snapshot", (records, journal records)).
+    """
+    kind, payload = change
+    if kind == "entries":
+        states = {}
+        _replay_states(states, payload, data.get)
+        return states
+    records, entries = payload
+    states = {s["id"]: s for s in records}
+    _replay_states(states, entries, lambda sid: None)
+    for sid in data.ids():
+        states.setdefault(sid, None)
+    return states
+
+def same_record(a, b):
+    fields = ("name", "cw1", "cw2", "cw3", "exam")
+    return a is b or (a is not None and b is not None and all(a[f] == b[f] for f in fields))
+
+def apply_state(data, sid, state):
+    """Make the store's record for sid match state (None removes it)"""
+    current = data.get(sid)
+    if current and (state is None or current["name"] != state["name"]):
+        data.remove(sid)
+        current = None
+    if state is None:
+        return
+    if current:
+        data.update(sid, state["cw1"], state["cw2"], state["cw3"], state["exam"])
+    else:
+        data.add(make_student(sid, state["name"], state["cw1"], state["cw2"], state["cw3"], state["exam"]))
+
+def merge_external(data, states, bases=None):
+    """Three-way merge of external states into the store.
+
+    bases maps each ID edited here to the states it has had here since the
+    files were last in sync (None where it did not exist). An external state
+    that is one of those is only missing our edit, so the ID is returned as
+    unsaved; any other difference on an edited record is a conflict.
+    Returns (applied IDs, conflicts, unsaved IDs); a conflict is (id, mine, theirs).
+    """
+    bases = bases or {}
+    applied, conflicts, unsaved = [], [], []
+    for sid, theirs in states.items():
+        mine = data.get(sid)
+        if same_record(mine, theirs):
+            continue
+        if sid not in bases:
+            apply_state(data, sid, theirs)
+            applied.append(sid)
+        elif any(same_record(theirs, base) for base in bases[sid]):
+            unsaved.append(sid)
+        else:
+            conflicts.append((sid, mine, theirs))
+    return applied, conflicts, unsaved
+
+def coalesce_entries(entries):
+    """Collapse a burst of journal records to the fewest with the same replay result.
+
+    Records for different IDs are independent, so each ID keeps at most a
+    delete followed by one add or update carrying its latest marks.
+    """
+    by_id = {}
+    for entry in entries:
+        ops = by_id.setdefault(entry[1], [])
+        if entry[0] == "D":
+            ops[:] = [entry]
+        elif entry[0] == "U" and ops and ops[-1][0] in ("A", "U"):
+            ops[-1] = tuple(ops[-1][:-4]) + tuple(entry[2:6])
+        else:
+            ops.append(entry)
+    return [entry for ops in by_id.values() for entry in ops]
+
+def write_journal(entries, path=JOURNAL_FILE):
+    """Append records to the journal as one line and return the (start, end) byte offsets written"""
+    fields = [str(field) for entry in entries for field in entry]
+    if len(entries) > 1:
+        fields.insert(0, BATCH_OP)
+    with open(path, "a") as f:
+        start = f.tell()
+        f.write(",".join(fields) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+        return start, f.tell()
+
+def temp_path(path):
+    """A scratch name beside path that no other process or thread will pick"""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+def write_snapshot_file(rows, data_file=DATA_FILE):
+    """Write (id, name, cw1, cw2, cw3, exam) rows to a temporary file beside data_file and return its name"""
+    tmp_file = temp_path(data_file)
+    with open(tmp_file, "w") as f:
+        f.write(str(len(rows)) + "\n")
+        f.writelines(f"{sid},{name},{cw1},{cw2},{cw3},{exam}\n" for sid, name, cw1, cw2, cw3, exam in rows)
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp_file
+
+def install_snapshot(tmp_file, data_file=DATA_FILE, journal_file=JOURNAL_FILE):
+    """Swap a written snapshot in as the data file, then clear the journal"""
+    os.replace(tmp_file, data_file)
+    # If we die before this truncate, replaying the journal is harmless
+    open(journal_file, "w").close()
+
+def replay_rows(rows, entries):
+    """Apply journal records to (id, name, cw1, cw2, cw3, exam) rows as replay_journal does to a store"""
+    table = {row[0]: row for row in rows}
+    for parts in entries:
+        op, sid = parts[0], parts[1]
+        if op == "A" and len(parts) == 7:
+            name = table[sid][1] if sid in table else parts[2]
+            table[sid] = (sid, name, *(int(m) for m in parts[3:7]))
+        elif op == "U" and len(parts) == 6 and sid in table:
+            table[sid] = (sid, table[sid][1], *(int(m) for m in parts[2:6]))
+        elif op == "D":
+            table.pop(sid, None)
+    return list(table.values())
+
+def write_snapshot(rows, data_file=DATA_FILE, journal_file=JOURNAL_FILE):
+    """Write (id, name, cw1, cw2, cw3, exam) rows as the new data file, then clear the journal"""
+    install_snapshot(write_snapshot_file(rows, data_file), data_file, journal_file)
+
+def snapshot_rows(data):
+    return [(s['id'], s['name'], s['cw1'], s['cw2'], s['cw3'], s['exam']) for s in data]
+
+# ---------------- Storage Backends ----------------
+# Backends stream records in at startup and persist edits given as journal
+# tuples: ("A", id, name, cw1, cw2, cw3, exam), ("U", id, cw1, cw2, cw3, exam)
+# or ("D", id). Set STUDENT_STORAGE=sqlite to use the SQLite backend.
+STORAGE_BACKEND = os.environ.get("STUDENT_STORAGE", "text")
+SQLITE_FILE = "studentMarks.db"
+
+class FileLock:
+    """Advisory lock on a side file, held only while files are read or written.
+
+        with FileLock(LOCK_FILE):                   # writers
+        with FileLock(LOCK_FILE, exclusive=False):  # readers
+
+    Uses fcntl.flock where available. msvcrt has no shared locks, so on
+    Windows readers lock exclusively too; elsewhere locking is skipped.
+    """
+    def __init__(self, path=LOCK_FILE, exclusive=True):
+        self.path = path
+        self.exclusive = exclusive
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, "a+b")
+        try:
+            if fcntl:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH)
+            elif msvcrt:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+        except BaseException:
+            self._file.close()
+            raise
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            if fcntl:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            elif msvcrt:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+class ExternalChangeError(RuntimeError):
+    """Raised instead of overwriting files another program has changed"""
+
+class ConflictError(ExternalChangeError):
+    """An append was refused for records another program has changed since we last synced.
+
+    entries are the edits that were not written. change and token are what
+    poll_changes() would have returned; merge the change, then pass the
+    token to mark_synced() before writing the edits again.
+    """
+    def __init__(self, entries, change, token):
+        super().__init__(f"{len(entries)} record(s) were changed by another program")
+        self.entries = entries
+        self.change = change
+        self.token = token
+
+class TextStorage:
+    """studentMarks.txt snapshot plus the append-only change journal.
+
+    Several programs may share the files. Appends and compactions hold an
+    exclusive FileLock only for the write itself, and reads a shared one.
+    Every journal record is a new version of one student, so an append is
+    refused with ConflictError for any record that has versions we have not
+    read yet; edits to other records go through. Each append is one journal
+    line, so it survives a crash whole or not at all.
+    """
+    needs_compaction = True
+    TAIL_BYTES = 64
+
+    def __init__(self, data_file=DATA_FILE, journal_file=JOURNAL_FILE, lock_file=None):
+        self.data_file = data_file
+        self.journal_file = journal_file
+        self.lock_file = lock_file or os.path.splitext(data_file)[0] + ".lock"
+        # What we last read or wrote ourselves: (size, mtime, last bytes) of
+        # the data file and how far into the journal we have applied
+        self._data_seen = None
+        self._journal_pos = 0
+
+    def _data_state(self, size=None):
+        """(size, mtime, tail bytes) of the data file, cut at size if given"""
+        try:
+            with open(self.data_file, "rb") as f:
+                st = os.fstat(f.fileno())
+                size = st.st_size if size is None else size
+                f.seek(max(0, size - self.TAIL_BYTES))
+                return size, st.st_mtime_ns, f.read(min(size, self.TAIL_BYTES))
+        except FileNotFoundError:
+            return None
+
+    def iter_chunks(self, errors=None):
+        self._data_seen = self._data_state()
+        yield from iter_student_chunks(self.data_file, errors=errors, stored=True)
+
+    def read_changes(self):
+        # The snapshot was read unlocked; if it has since been replaced,
+        # _data_seen no longer matches and the next poll re-reads everything
+        with FileLock(self.lock_file, exclusive=False):
+            entries, self._journal_pos = read_journal_tail(self.journal_file)
+        return entries
+
+    def append(self, entries):
+        """Write entries unless another program has changed their records since we synced.
+
+        Edits to records nobody else has touched are written either way;
+        the rest are left out and raised in a ConflictError.
+        """
+        withheld = []
+        with FileLock(self.lock_file):
+            if self._data_changed():
+                # Another program has compacted, so we cannot tell which
+                # records it changed; hand everything back to be merged
+                change, token = self._read_everything()
+                raise ConflictError(list(entries), change, token)
+            if self._journal_size() > self._journal_pos:
+                theirs, end = read_journal_tail(self.journal_file, self._journal_pos)
+                touched = {parts[1] for parts in theirs}
+                withheld = [entry for entry in entries if entry[1] in touched]
+                entries = [entry for entry in entries if entry[1] not in touched]
+            if entries:
+                start, end = write_journal(entries, self.journal_file)
+                # If another program appended first, leave its lines for poll_changes
+                if start == self._journal_pos:
+                    self._journal_pos = end
+        if withheld:
+            raise ConflictError(withheld, ("entries", theirs), (self._data_seen, end))
+
+    def _data_changed(self):
+        current = self._data_state()
+        return (current and current[:2]) != (self._data_seen and self._data_seen[:2])
+
+    def _journal_size(self):
+        try:
+            return os.path.getsize(self.journal_file)
+        except FileNotFoundError:
+            return 0
+
+    def changed_externally(self):
+        """True if another program has written either file since we last synced"""
+        return self._data_changed() or self._journal_size() != self._journal_pos
+
+    def regrade(self, only_if_changed=False):
+        # Only marks are stored, so there are no grades to rewrite
+        pass
+
+    def compact(self, rows):
+        """Rewrite the snapshot from rows plus whatever other programs have journalled since we synced.
+
+        Returns None, or (change, token) like poll_changes() for the caller
+        to merge into its store: the journal lines folded in or, if another
+        program has compacted since we synced, its snapshot. In that case
+        nothing is written, since its compaction already holds everything
+        journalled, so callers must journal their edits before compacting.
+        """
+        # Write the snapshot before locking; it is only rewritten under the
+        # lock if other programs have appended meanwhile
+        tmp_file = write_snapshot_file(rows, self.data_file)
+        change = None
+        try:
+            with FileLock(self.lock_file):
+                journal_size = self._journal_size()
+                if self._data_changed() or journal_size < self._journal_pos:
+                    return self._read_everything()
+                if journal_size > self._journal_pos:
+                    theirs, _ = read_journal_tail(self.journal_file, self._journal_pos)
+                    rows = replay_rows(rows, theirs)
+                    change = ("entries", theirs)
+                    write_snapshot_file(rows, self.data_file)  # the same scratch file again
+                install_snapshot(tmp_file, self.data_file, self.journal_file)
+                self._data_seen = self._data_state()
+                self._journal_pos = 0
+        finally:
+            if os.path.exists(tmp_file):
+                os.remove(tmp_file)
+        return change and (change, (self._data_seen, self._journal_pos))
+
+    def poll_changes(self):
+        """Look for writes by other programs; return None or (change, sync token).
+
+        Lines appended to the journal or to the data file are read on their
+        own. Anything else re-reads both files in full. Pass the token to
+        mark_synced() once the change has been merged into the store.
+        """
+        with FileLock(self.lock_file, exclusive=False):
+            return self._poll_changes()
+
+    def _poll_changes(self):
+        seen, current = self._data_seen, self._data_state()
+        journal_size = self._journal_size()
+        if (current and current[:2]) == (seen and seen[:2]):
+            if journal_size == self._journal_pos:
+                return None
+            if journal_size > self._journal_pos:
+                entries, end = read_journal_tail(self.journal_file, self._journal_pos)
+                return ("entries", entries), (seen, end)
+        elif (seen and current and current[0] > seen[0] and journal_size == self._journal_pos
+              and self._data_state(seen[0])[2] == seen[2] and seen[2].endswith(b"\n")):
+            entries, size = self._read_appended_lines(seen[0])
+            if size == seen[0]:
+                return None
+            return ("entries", entries), (self._data_state(size), self._journal_pos)
+        return self._read_everything()
+
+    def _read_everything(self):
+        current, records = self._data_state(), []
+        if current:
+            for chunk in iter_student_chunks(self.data_file, stored=True):
+                records.extend(s for _, s in chunk)
+        entries, end = read_journal_tail(self.journal_file)
+        return ("snapshot", (records, entries)), (current, end)
+
+    def _read_appended_lines(self, offset):
+        with open(self.data_file, "rb") as f:
+            f.seek(offset)
+            tail = f.read()
+        complete = tail[:tail.rfind(b"\n") + 1]
+        entries = []
+        for line in complete.decode().splitlines():
+            try:
+                entries.append(("A", *parse_student_line(line, stored=True)))
+            except ValueError:
+                continue
+        return entries, offset + len(complete)
+
+    def mark_synced(self, token):
+        self._data_seen, self._journal_pos = token
+
+class SQLiteStorage:
+    """Students in a local SQLite database; studentMarks.txt is imported when it is empty.
+
+    Each batch of edits is one transaction. Reports that only read the
+    roster can run in SQL without loading it: iter_records() streams rows,
+    best first through the percent index; statistics() builds the class
+    totals and mark distributions from aggregate queries; search() ranks
+    matches as SearchIndex does. Substring matches cannot use a B-tree
+    index, so names are not indexed.
+    """
+    needs_compaction = False
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS students (
+            id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            cw1 INTEGER NOT NULL CHECK (cw1 BETWEEN 0 AND 255),
+            cw2 INTEGER NOT NULL CHECK (cw2 BETWEEN 0 AND 255),
+            cw3 INTEGER NOT NULL CHECK (cw3 BETWEEN 0 AND 255),
+            exam INTEGER NOT NULL CHECK (exam BETWEEN 0 AND 255),
+            overall INTEGER NOT NULL,
+            percent REAL NOT NULL,
+            grade TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS students_percent ON students (percent, id);
+        CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+    """
+    COLUMNS = "id, name, cw1, cw2, cw3, exam"
+
+    def __init__(self, path=SQLITE_FILE, text_file=DATA_FILE):
+        self.path = path
+        self.text_file = text_file
+        self._conn = None
+        self._lock = threading.Lock()
+        self._data_version = None
+
+    def connection(self):
+        # Created lazily so it belongs to whichever thread does the I/O
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(self.SCHEMA)
+            # SQLite's lower() only folds ASCII; search must match Python's
+            self._conn.create_function("py_lower", 1, str.lower, deterministic=True)
+        return self._conn
+
+    def prepare(self, errors=None):
+        """Import studentMarks.txt into an empty database and re-grade if the scheme has changed"""
+        conn = self.connection()
+        if conn.execute("SELECT COUNT(*) FROM students").fetchone()[0] == 0 and os.path.exists(self.text_file):
+            self.import_text(self.text_file, errors)
+        self.regrade(only_if_changed=True)
+
+    def iter_chunks(self, errors=None):
+        self.prepare(errors)
+        conn = self.connection()
+        with self._lock:
+            self._data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            cursor = conn.execute(f"SELECT rowid, {self.COLUMNS} FROM students ORDER BY rowid")
+            while True:
+                rows = cursor.fetchmany(LOAD_CHUNK_SIZE)
+                if not rows:
+                    break
+                yield [(row[0], make_student(*row[1:])) for row in rows]
+
+    def read_changes(self):
+        return []
+
+    def poll_changes(self):
+        """Re-read the table if another connection has committed since we last synced"""
+        with self._lock:
+            conn = self.connection()
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if version == self._data_version:
+                return None
+            rows = conn.execute(f"SELECT {self.COLUMNS} FROM students ORDER BY rowid").fetchall()
+        return ("snapshot", ([make_student(*row) for row in rows], [])), version
+
+    def mark_synced(self, token):
+        self._data_version = token
+
+    def _upsert(self, conn, s):
+        conn.execute(
+            "INSERT INTO students (id, name, cw1, cw2, cw3, exam, overall, percent, grade) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET "
+            "cw1 = excluded.cw1, cw2 = excluded.cw2, cw3 = excluded.cw3, exam = excluded.exam, "
+            "overall = excluded.overall, percent = excluded.percent, grade = excluded.grade",
+            (s["id"], s["name"], s["cw1"], s["cw2"], s["cw3"], s["exam"],
+             s["overall"], s["percent"], s["grade"]))
+
+    def append(self, entries):
+        """Apply a batch of edits in a single transaction"""
+        with self._lock:
+            conn = self.connection()
+            with conn:
+                for entry in entries:
+                    op, sid = entry[0], entry[1]
+                    if op == "A":
+                        self._upsert(conn, make_student(sid, entry[2], *[int(m) for m in entry[3:7]]))
+                    elif op == "U":
+                        s = make_student(sid, "", *[int(m) for m in entry[2:6]])
+                        conn.execute(
+                            "UPDATE students SET cw1 = ?, cw2 = ?, cw3 = ?, exam = ?, "
+                            "overall = ?, percent = ?, grade = ? WHERE id = ?",
+                            (s["cw1"], s["cw2"], s["cw3"], s["exam"],
+                             s["overall"], s["percent"], s["grade"], sid))
+                    elif op == "D":
+                        conn.execute("DELETE FROM students WHERE id = ?", (sid,))
+
+    def regrade(self, only_if_changed=False):
+        """Rewrite the stored overall, percent and grade columns under the current scheme"""
+        scheme = json.dumps(grading_scheme.to_dict(), sort_keys=True)
+        with self._lock:
+            conn = self.connection()
+            stored = conn.execute("SELECT value FROM settings WHERE key = 'grading'").fetchone()
+            if only_if_changed and stored and stored[0] == scheme:
+                return
+            graded = [make_student(*row) for row in conn.execute(f"SELECT {self.COLUMNS} FROM students")]
+            with conn:
+                conn.executemany(
+                    "UPDATE students SET overall = ?, percent = ?, grade = ? WHERE id = ?",
+                    ((s["overall"], s["percent"], s["grade"], s["id"]) for s in graded))
+                conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('grading', ?)", (scheme,))
+
+    def import_text(self, path, errors=None):
+        """Load a studentMarks.txt style file; existing IDs are overwritten"""
+        with self._lock:
+            conn = self.connection()
+            with conn:
+                for chunk in iter_student_chunks(path, errors=errors, stored=True):
+                    for line_no, s in chunk:
+                        self._upsert(conn, s)
+
+    def iter_records(self, by_percent=False):
+        """Stream the records in roster order or, by_percent, highest percentage first"""
+        order = "percent DESC, id DESC" if by_percent else "rowid"
+        with self._lock:
+            cursor = self.connection().execute(f"SELECT {self.COLUMNS} FROM students ORDER BY {order}")
+            while True:
+                rows = cursor.fetchmany(LOAD_CHUNK_SIZE)
+                if not rows:
+                    break
+                yield from (make_student(*row) for row in rows)
+
+    def statistics(self):
+        """Return (ClassAggregates, MarkAnalytics) for the roster, computed in SQL"""
+        aggregates, analytics = ClassAggregates(), MarkAnalytics()
+        with self._lock:
+            conn = self.connection()
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(overall), 0) FROM students").fetchone()
+            aggregates.count, aggregates.total_overall, analytics.count = count, total, count
+            for grade, n in conn.execute("SELECT grade, COUNT(*) FROM students GROUP BY grade"):
+                aggregates.grade_counts[grade] += n
+            for field, label, maximum in analytics.fields:
+                analytics.add_mark_counts(
+                    field, conn.execute(f"SELECT {field}, COUNT(*) FROM students GROUP BY {field}"))
+        return aggregates, analytics
+
+    def search(self, term):
+        """Records whose name or ID contains term, ranked like SearchIndex.search()"""
+        term = term.lower()
+        if not term:
+            return []
+        with self._lock:
+            rows = self.connection().execute(
+                f"SELECT {self.COLUMNS} FROM (SELECT *, py_lower(id) AS key_id, py_lower(name) AS key_name "
+                "FROM students) WHERE instr(key_name, :term) OR instr(key_id, :term) "
+                "ORDER BY CASE WHEN key_id = :term THEN 0 "
+                "WHEN substr(key_id, 1, length(:term)) = :term THEN 1 "
+                "WHEN substr(key_name, 1, length(:term)) = :term THEN 2 "
+                "WHEN instr(key_name, ' ' || :term) THEN 3 ELSE 4 END, key_name, id",
+                {"term": term}).fetchall()
+        return [make_student(*row) for row in rows]
+
+def open_storage(backend=None):
+    if (backend or STORAGE_BACKEND) == "sqlite":
+        return SQLiteStorage()
+    return TextStorage()
+
+# ---------------- Sharded Cohorts ----------------
+# A faculty keeps one marks file per module or cohort in a directory. Each
+# shard is summarised on its own, in parallel, and only the summaries are
+# merged; records are loaded for one shard at a time when asked for.
+SHARD_PATTERN = "*.txt"
+
+def file_stamp(path):
+    """(size, mtime) of a file; a different stamp means it has changed"""
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+def summarise_shard(path, scheme=None):
+    """Stream one shard into its partial statistics; runs in a worker process"""
+    aggregates, analytics, errors = ClassAggregates(scheme), MarkAnalytics(scheme), []
+    try:
+        stamp = file_stamp(path)
+        for chunk in iter_student_chunks(path, errors=errors, scheme=scheme):
+            for _, s in chunk:
+                aggregates.add(s)
+                analytics.add(s)
+    except OSError as e:
+        stamp = None
+        errors.append((0, str(e)))
+    return path, stamp, aggregates, analytics, errors
+
+class ShardSet:
+    """Every marks file in a directory, summarised per shard and merged on demand"""
+    def __init__(self, directory, pattern=SHARD_PATTERN, workers=None):
+        self.directory = directory
+        self.pattern = pattern
+        self.workers = workers
+        # path -> (stamp, aggregates, analytics, errors)
+        self.summaries = {}
+        self._stores = {}
+        self._scheme = grading_scheme
+
+    def paths(self):
+        return sorted(glob.glob(os.path.join(self.directory, self.pattern)))
+
+    def refresh(self):
+        """Re-summarise new and changed shards only; return their paths"""
+        if self._scheme is not grading_scheme:
+            # Grades depend on the scheme, so everything is summarised again
+            self.summaries.clear()
+            self._stores.clear()
+            self._scheme = grading_scheme
+        paths = self.paths()
+        for gone in set(self.summaries) - set(paths):
+            del self.summaries[gone]
+            self._stores.pop(gone, None)
+        stale = []
+        for path in paths:
+            try:
+                stamp = file_stamp(path)
+            except OSError:
+                stamp = None
+            if path not in self.summaries or self.summaries[path][0] != stamp:
+                stale.append(path)
+        if len(stale) > 1 and self.workers != 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(summarise_shard, stale, itertools.repeat(grading_scheme)))
+        else:
+            results = [summarise_shard(path) for path in stale]
+        for path, stamp, aggregates, analytics, errors in results:
+            self.summaries[path] = (stamp, aggregates, analytics, errors)
+        return stale
+
+    def totals(self):
+        """Faculty-wide (ClassAggregates, MarkAnalytics) merged from every shard"""
+        aggregates, analytics = ClassAggregates(), MarkAnalytics()
+        for stamp, shard_aggregates, shard_analytics, errors in self.summaries.values():
+            aggregates.merge(shard_aggregates)
+            analytics.merge(shard_analytics)
+        return aggregates, analytics
+
+    def errors(self):
+        """Yield (path, line number, reason) for every problem found"""
+        for path, summary in self.summaries.items():
+            for line_no, reason in summary[3]:
+                yield path, line_no, reason
+
+    def load(self, path, errors=None):
+        """Records of one shard, parsed again only if the file has changed"""
+        stamp = file_stamp(path)
+        cached = self._stores.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        data = StudentStore()
+        for chunk in iter_student_chunks(path, errors=errors):
+            add_loaded_chunk(data, chunk, errors)
+        self._stores[path] = (stamp, data)
+        return data
+
+# ---------------- Batch Edits ----------------
+def parse_mark_batch(text, data):
+    """Validate CSV mark rows against the roster; return (updates, errors).
+
+    Rows are id,cw1,cw2,cw3,exam or the studentMarks layout with a name
+    column, and a leading header row is skipped. Updates are
+    (id, cw1, cw2, cw3, exam) tuples; errors are (row number, message).
+    """
+    updates, errors, seen = [], [], set()
+    scheme = grading_scheme
+    for row_no, row in enumerate(csv.reader(io.StringIO(text)), 1):
+        row = [field.strip() for field in row]
+        if not any(row):
+            continue
+        if row_no == 1 and row[0].lower() in HEADER_IDS:
+            continue
+        if len(row) == 6:
+            row = [row[0]] + row[2:]
+        if len(row) != 5:
+            errors.append((row_no, f"expected an ID and four marks, found {len(row)} fields"))
+            continue
+        sid = row[0]
+        if sid not in data:
+            errors.append((row_no, f"unknown student ID {sid}"))
+            continue
+        if sid in seen:
+            errors.append((row_no, f"student {sid} is listed more than once"))
+            continue
+        try:
+            marks = [int(mark) for mark in row[1:]]
+        except ValueError:
+            errors.append((row_no, "marks must be whole numbers"))
+            continue
+        bad = scheme.mark_problems(marks)
+        if bad:
+            errors.append((row_no, "; ".join(bad)))
+            continue
+        seen.add(sid)
+        updates.append((sid, *marks))
+    return updates, errors
+
+def apply_mark_batch(data, updates):
+    """Apply validated updates to the store and return them as journal entries"""
+    entries = []
+    for sid, cw1, cw2, cw3, exam in updates:
+        data.update(sid, cw1, cw2, cw3, exam)
+        entries.append(("U", sid, cw1, cw2, cw3, exam))
+    return entries
+
+def commit_mark_batch(storage, data, entries):
+    """Persist a whole batch in one atomic step: a snapshot swap or one transaction"""
+    if storage.needs_compaction:
+        result = storage.compact(snapshot_rows(data))
+        if result and result[0][0] == "snapshot":
+            # Another program compacted first and our snapshot was not written
+            raise ExternalChangeError("studentMarks.txt was changed by another program")
+    else:
+        storage.append(entries)
+
+# ---------------- Reports ----------------
+def format_student(s):
+    return (f"Student Name: {s['name']}\n"
+            f"Student ID: {s['id']}\n"
+            f"Coursework Marks: {s['cw1']}, {s['cw2']}, {s['cw3']}\n"
+            f"Coursework Total: {s['cw_total']}/{sum(grading_scheme.maximums[:3])}\n"
+            f"Exam Mark: {s['exam']}/{grading_scheme.maximums[3]}\n"
+            f"Overall Percentage: {s['percent']:.1f}%\n"
+            f"Final Grade: {s['grade']}\n"
+            f"{'-'*40}\n")
+
+RENDER_CACHE_SIZE = 20000
+
+class RenderCache:
+    """Bounded LRU cache of format_student() text keyed by (id, version).
+
+    An edit gives the record a new version, so its old text is never hit
+    again and simply ages out of the cache.
+    """
+    def __init__(self, maxsize=RENDER_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def render(self, data, s):
+        key = (s["id"], data.version(s["id"]))
+        text = self._entries.get(key)
+        if text is None:
+            text = format_student(s)
+            self._entries[key] = text
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        else:
+            self._entries.move_to_end(key)
+        return text
+
+render_cache = RenderCache()
+
+def render_student(data, s):
+    return render_cache.render(data, s)
+
+def format_statistics(data):
+    if not data:
+        return "No student data available for statistics"
+    
+    return format_class_statistics(data.aggregates, data.analytics)
+
+def format_class_statistics(stats, analytics, title="CLASS STATISTICS AND GRADE DISTRIBUTION"):
+    """Statistics text from totals alone, so merged shards can use it too"""
+    if not stats.count:
+        return "No student data available for statistics"
+    scale = 100 / analytics.total
+    text = title + "\n" + "="*50 + "\n\n"
+    text += f"Total Students: {stats.count}\n"
+    text += f"Average Percentage: {stats.average():.1f}%\n"
+    text += f"Highest Percentage: {analytics.highest() * scale:.1f}%\n"
+    text += f"Median Percentage: {analytics.quantile(0.5) * scale:.1f}%\n"
+    text += f"Lowest Percentage: {analytics.lowest() * scale:.1f}%\n\n"
+    text += "Grade Distribution:\n"
+    for grade, count in stats.grade_counts.items():
+        text += f"{grade} Grades: {count}\n"
+    text += "\n" + format_distributions(analytics)
+    return text
+
+def format_shard_statistics(shards):
+    """Faculty-wide statistics followed by a one-line summary per shard"""
+    text = format_class_statistics(*shards.totals(), title="FACULTY STATISTICS ACROSS ALL COHORTS")
+    text += "\nCohorts:\n"
+    for path, (stamp, stats, analytics, errors) in shards.summaries.items():
+        text += f"{os.path.basename(path)}: {stats.count} students, average {stats.average():.1f}%"
+        text += f", {len(errors)} problem(s)\n" if errors else "\n"
+    return text
+
+def format_grading_scheme(scheme):
+    text = "GRADING SCHEME\n" + "="*50 + "\n\n"
+    text += "Grade Boundaries:\n"
+    for letter, percent in reversed(list(zip(scheme.letters[1:], scheme.boundaries))):
+        text += f"{letter}: {percent:g}% and above\n"
+    text += f"{scheme.letters[0]}: below {scheme.boundaries[0]:g}%\n\n" if scheme.boundaries else "\n"
+    text += "Components:\n"
+    for (field, label, maximum), weight in zip(scheme.limits, scheme.weights):
+        text += f"{label}: out of {maximum}, weight {weight}\n"
+    text += f"\nOverall mark out of {scheme.total}\n"
+    return text
+
+HISTOGRAM_BAR = 30
+
+def format_histogram(analytics, field, width=None, scale=1):
+    """One text bar per bin; scale converts marks to the printed units"""
+    bins = analytics.histogram(field, width)
+    tallest = max(count for low, high, count in bins) or 1
+    lines = []
+    for low, high, count in bins:
+        bar = "#" * round(count / tallest * HISTOGRAM_BAR)
+        lines.append(f"{low * scale:5.0f}-{high * scale:<4.0f}| {bar} {count}\n")
+    return "".join(lines)
+
+def format_distributions(analytics):
+    """Spread of the overall percentage and of each mark component"""
+    if not analytics.count:
+        return "No student data available for statistics\n"
+    scale = 100 / analytics.total
+    q1, median, q3 = analytics.quartiles()
+    text = "Overall Percentage Distribution:\n"
+    text += f"Mean: {analytics.mean() * scale:.1f}%   Std Dev: {analytics.stdev() * scale:.1f}%\n"
+    text += f"Lowest: {analytics.lowest() * scale:.1f}%   Q1: {q1 * scale:.1f}%   "
+    text += f"Median: {median * scale:.1f}%   Q3: {q3 * scale:.1f}%   Highest: {analytics.highest() * scale:.1f}%\n"
+    text += format_histogram(analytics, "overall", scale=scale)
+    for field, label, maximum in analytics.fields[:-1]:
+        q1, median, q3 = analytics.quartiles(field)
+        text += f"\n{label} (out of {maximum}):\n"
+        text += f"Mean: {analytics.mean(field):.1f}   Std Dev: {analytics.stdev(field):.1f}   "
+        text += f"Min: {analytics.lowest(field)}   Q1: {q1:g}   Median: {median:g}   "
+        text += f"Q3: {q3:g}   Max: {analytics.highest(field)}\n"
+        text += format_histogram(analytics, field)
+    return text
+
+# ---------------- Report Export ----------------
+# Reports are written record by record from a generator, so exporting a
+# whole cohort never builds the report in memory.
+REPORT_FORMATS = ("text", "csv", "json")
+REPORT_COLUMNS = ("id", "name", "cw1", "cw2", "cw3", "exam", "cw_total", "overall", "percent", "grade")
+
+def report_format(path):
+    """Pick the format from the file extension: .csv, .json, anything else is text"""
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    return ext if ext in REPORT_FORMATS else "text"
+
+def write_records_report(records, out, fmt="text", title="ALL STUDENT RECORDS"):
+    """Stream records to an open file; return how many were written"""
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(REPORT_COLUMNS)
+        for count, s in enumerate(records, 1):
+            writer.writerow([s['id'], s['name'], s['cw1'], s['cw2'], s['cw3'], s['exam'],
+                             s['cw_total'], s['overall'], f"{s['percent']:.1f}", s['grade']])
+    elif fmt == "json":
+        out.write("[")
+        for count, s in enumerate(records, 1):
+            row = {f: s[f] for f in REPORT_COLUMNS}
+            row["percent"] = round(row["percent"], 2)
+            out.write(("\n  " if count == 1 else ",\n  ") + json.dumps(row))
+        out.write("\n]\n" if count else "]\n")
+    else:
+        out.write(title + "\n" + "="*50 + "\n\n")
+        for count, s in enumerate(records, 1):
+            out.write(f"Record {count}:\n")
+            out.write(format_student(s))
+        out.write(f"\n{count} record(s)\n")
+    return count
+
+def statistics_summary(stats, analytics):
+    """Class statistics as plain values, for CSV and JSON export"""
+    scale = 100 / analytics.total
+
+    def spread(field, scale=1):
+        q1, median, q3 = analytics.quartiles(field)
+        return {
+            "mean": analytics.mean(field) * scale, "stdev": analytics.stdev(field) * scale,
+            "lowest": analytics.lowest(field) * scale, "q1": q1 * scale, "median": median * scale,
+            "q3": q3 * scale, "highest": analytics.highest(field) * scale,
+            "histogram": [{"low": low, "high": high, "count": count}
+                          for low, high, count in analytics.histogram(field)],
+        }
+
+    return {
+        "total_students": stats.count,
+        "average_percent": stats.average(),
+        "grade_counts": dict(stats.grade_counts),
+        "overall_percent": spread("overall", scale),
+        "components": {field: dict(maximum=maximum, **spread(field))
+                       for field, label, maximum in analytics.fields[:-1]},
+    }
+
+def _flatten(value, prefix=""):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, f"{prefix}.{key}" if prefix else key)
+    elif isinstance(value, list):
+        for item in value:
+            yield f"{prefix}.{item['low']}-{item['high']}", item["count"]
+    else:
+        yield prefix, value
+
+def write_statistics_report(stats, analytics, out, fmt="text"):
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(("measure", "value"))
+        writer.writerows(_flatten(statistics_summary(stats, analytics)))
+    elif fmt == "json":
+        json.dump(statistics_summary(stats, analytics), out, indent=2)
+        out.write("\n")
+    else:
+        out.write(format_class_statistics(stats, analytics))
+        out.write("\n")
+
+def export_records(path, records, fmt=None, title="ALL STUDENT RECORDS"):
+    """Write records to a text, CSV or JSON file chosen by extension; return the count"""
+    fmt = fmt or report_format(path)
+    with open(path, "w", newline="" if fmt == "csv" else None) as out:
+        return write_records_report(records, out, fmt, title)
+
+def export_search(path, data, term, fmt=None):
+    ids, complete = data.search(term)
+    return export_records(path, (data.get(sid) for sid in ids), fmt, f"SEARCH RESULTS FOR '{term}'")
+
+def export_statistics(path, stats, analytics, fmt=None):
+    fmt = fmt or report_format(path)
+    with open(path, "w", newline="" if fmt == "csv" else None) as out:
+        write_statistics_report(stats, analytics, out, fmt)
@@ -0,0 +1,100 @@
+"""Opt-in latency metrics and profiling for GUI command handlers.
+
+Set STUDENT_METRICS=1 to record a latency histogram per command, and
+STUDENT_PROFILE_MS=<ms> as well to keep cProfile stats for any call that
+takes at least that long. When metrics are off, instrument() hands back
+the original function, so there is no overhead at all.
+"""
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import time
+
+METRICS_FILE = "studentMetrics.json"
+BUCKET_LIMITS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class CommandMetrics:
+    """Per-command call counts, latency histograms and slow-call profiles"""
+
+    def __init__(self, enabled=None, profile_ms=None):
+        if enabled is None:
+            enabled = os.environ.get("STUDENT_METRICS") == "1"
+        if profile_ms is None and os.environ.get("STUDENT_PROFILE_MS"):
+            profile_ms = float(os.environ["STUDENT_PROFILE_MS"])
+        self.enabled = enabled
+        self.profile_ms = profile_ms
+        self.commands = {}
+        self.profiles = {}
+
+    def instrument(self, name, func):
+        """Wrap a handler so every call is timed under the given name"""
+        if not self.enabled:
+            return func
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            profiler = cProfile.Profile() if self.profile_ms is not None else None
+            start = time.perf_counter()
+            try:
+                if profiler:
+                    return profiler.runcall(func, *args, **kwargs)
+                return func(*args, **kwargs)
+            finally:
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                self.record(name, elapsed_ms)
+                if profiler and elapsed_ms >= self.profile_ms:
+                    self._keep_profile(name, elapsed_ms, profiler)
+        return timed
+
+    def record(self, name, elapsed_ms):
+        stats = self.commands.get(name)
+        if stats is None:
+            stats = self.commands[name] = {
+                "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                "histogram": [0] * (len(BUCKET_LIMITS_MS) + 1),
+            }
+        stats["count"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+        bucket = next((i for i, limit in enumerate(BUCKET_LIMITS_MS) if elapsed_ms < limit),
+                      len(BUCKET_LIMITS_MS))
+        stats["histogram"][bucket] += 1
+
+    def _keep_profile(self, name, elapsed_ms, profiler):
+        # Only the slowest call of each command is kept
+        kept = self.profiles.get(name)
+        if kept and kept["elapsed_ms"] >= elapsed_ms:
+            return
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(25)
+        self.profiles[name] = {"elapsed_ms": elapsed_ms, "stats": out.getvalue()}
+
+    def summary(self):
+        if not self.enabled:
+            return ("Command metrics are off.\n"
+                    "Start the program with STUDENT_METRICS=1 to record handler latencies.")
+        text = "COMMAND LATENCY DIAGNOSTICS\n" + "="*50 + "\n"
+        text += "(times include any dialogs the command waits on)\n\n"
+        if not self.commands:
+            text += "No commands recorded yet.\n"
+        labels = [f"<{limit}ms" for limit in BUCKET_LIMITS_MS] + [f">={BUCKET_LIMITS_MS[-1]}ms"]
+        for name, stats in sorted(self.commands.items()):
+            mean = stats["total_ms"] / stats["count"]
+            text += f"{name}: {stats['count']} call(s), mean {mean:.1f} ms, max {stats['max_ms']:.1f} ms\n"
+            for label, count in zip(labels, stats["histogram"]):
+                if count:
+                    text += f"    {label:>9}: {count}\n"
+        for name, kept in sorted(self.profiles.items()):
+            text += f"\nSlowest profiled call of {name} ({kept['elapsed_ms']:.1f} ms):\n{kept['stats']}"
+        return text
+
+    def dump(self, path=METRICS_FILE):
+        if not self.enabled:
+            return
+        with open(path, "w") as f:
+            json.dump({"bucket_limits_ms": BUCKET_LIMITS_MS, "commands": self.commands,
+                       "profiles": self.profiles}, f, indent=2)